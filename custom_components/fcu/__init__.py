@@ -1,86 +1,269 @@
 """Fan Coil Unit integration."""
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
 import asyncio
 import logging
-import json
-import ast
 from datetime import timedelta
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.exceptions import ConfigEntryNotReady
-import aiohttp
+from homeassistant.util import slugify
+
+from .api import FCUApi, HttpTransport
+from .const import (
+    DOMAIN, PLATFORMS, CONF_T1D, CONF_T2D, CONF_T3D, CONF_T4D, CONF_SHUTDOWN_DELAY,
+    CONF_PRECONDITION, CONF_OCCUPANCY_START, CONF_PRECONDITION_MAX_LEAD,
+    CONF_MQTT_BRIDGE, CONF_MQTT_TOPIC, DEFAULT_MQTT_BRIDGE, DEFAULT_MQTT_TOPIC,
+    CONF_FAN_POWER_LOW, CONF_FAN_POWER_MEDIUM, CONF_FAN_POWER_HIGH,
+    CONF_COIL_CAPACITY_LOW, CONF_COIL_CAPACITY_MEDIUM, CONF_COIL_CAPACITY_HIGH,
+    CONF_CAPTURE_TRAFFIC, CONF_REPLAY_FILE, CONF_REPLAY_SPEED,
+    DEFAULT_CAPTURE_TRAFFIC, DEFAULT_REPLAY_FILE, DEFAULT_REPLAY_SPEED,
+    CONF_TIMEOUT_FLOOR, CONF_TIMEOUT_CEILING, DEFAULT_TIMEOUT_FLOOR, DEFAULT_TIMEOUT_CEILING,
+    CONF_PROFILE_SETUP, DEFAULT_PROFILE_SETUP,
+    CONF_LOOP_GROUP, CONF_LOOP_AGGREGATE_ONLY, DEFAULT_LOOP_GROUP, DEFAULT_LOOP_AGGREGATE_ONLY,
+)
+from .control import ModeMemory
+from .energy import EnergyMeter
+from .fleet import FleetPipeline
+from .latency import LatencyTracker
+from .lifecycle import EntryLifecycle
+from .loops import async_join_loop
+from .profiling import SetupProfiler
+from .thermal import ThermalModel
+
+# Load the platforms as part of the integration import, in the same
+# executor job, rather than one by one while entries are forwarded.
+from . import climate, number, select, sensor  # noqa: E402,F401  pylint: disable=unused-import
 
-from .const import DOMAIN, PLATFORMS
+IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED
 
 _LOGGER = logging.getLogger(__name__)
 
+# Options that take effect without reloading the entry: the extraconfig
+# values are pushed to the device by the options flow itself, and the
+# pre-conditioning and energy settings are read on every poll.
+LIVE_OPTIONS = {
+    CONF_T1D, CONF_T2D, CONF_T3D, CONF_T4D, CONF_SHUTDOWN_DELAY,
+    CONF_PRECONDITION, CONF_OCCUPANCY_START, CONF_PRECONDITION_MAX_LEAD,
+    CONF_FAN_POWER_LOW, CONF_FAN_POWER_MEDIUM, CONF_FAN_POWER_HIGH,
+    CONF_COIL_CAPACITY_LOW, CONF_COIL_CAPACITY_MEDIUM, CONF_COIL_CAPACITY_HIGH,
+}
+
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up the FCU component."""
     hass.data.setdefault(DOMAIN, {})
     return True
 
-async def async_fetch_data(ip_address):
-    """Fetch data from device."""
-    _LOGGER.debug("Fetching data from %s", ip_address)
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"http://{ip_address}/wifi/shortstatus",
-                timeout=aiohttp.ClientTimeout(total=8)
-            ) as response:
-                text = await response.text()
-                _LOGGER.debug("Raw response: %s", text)
-                if response.status != 200:
-                    raise UpdateFailed(f"Error {response.status}")
-                data = text.replace("'", '"')
-                try:
-                    parsed_data = json.loads(data)
-                    # Ensure these values are properly parsed
-                    parsed_data["device_status"] = str(parsed_data.get("device_status", "0"))
-                    parsed_data["error_index"] = str(parsed_data.get("error_index", "0"))
-                    _LOGGER.debug("Parsed data: %s", parsed_data)
-                    return parsed_data
-                except json.JSONDecodeError:
-                    parsed_data = ast.literal_eval(text)
-                    parsed_data["device_status"] = str(parsed_data.get("device_status", "0"))
-                    parsed_data["error_index"] = str(parsed_data.get("error_index", "0"))
-                    return parsed_data
-    except Exception as ex:
-        _LOGGER.error("Error fetching data: %s", str(ex))
-        raise
+async def _async_create_transport(hass: HomeAssistant, entry: ConfigEntry):
+    """Return a replaying and/or recording transport, or None for plain HTTP."""
+    transport = None
+    replay_file = entry.options.get(CONF_REPLAY_FILE, DEFAULT_REPLAY_FILE)
+    if replay_file:
+        from .replay import ReplayTransport
+
+        try:
+            transport = await ReplayTransport.async_from_file(
+                hass,
+                hass.config.path(replay_file),
+                entry.options.get(CONF_REPLAY_SPEED, DEFAULT_REPLAY_SPEED),
+            )
+        except OSError as ex:
+            raise ConfigEntryNotReady(f"Cannot read replay file {replay_file}: {ex}") from ex
+        _LOGGER.warning("%s is replaying %s instead of polling", entry.data["name"], replay_file)
+
+    if entry.options.get(CONF_CAPTURE_TRAFFIC, DEFAULT_CAPTURE_TRAFFIC):
+        from .replay import RecordingTransport
+
+        path = hass.config.path(f"{DOMAIN}_capture_{slugify(entry.data['name'])}.jsonl")
+        transport = RecordingTransport(
+            hass, transport or HttpTransport(entry.data["ip_address"]), path
+        )
+        _LOGGER.info("Recording %s traffic to %s", entry.data["name"], path)
+    return transport
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up FCU from a config entry."""
     hass.data.setdefault(DOMAIN, {})
-    
-    coordinator = DataUpdateCoordinator(
-        hass,
-        _LOGGER,
-        name=entry.data["name"],
-        update_method=lambda: async_fetch_data(entry.data["ip_address"]),
-        update_interval=timedelta(seconds=30),  # Update every 30 seconds
+    profiler = SetupProfiler(
+        entry.data["name"],
+        IMPORT_SECONDS,
+        entry.options.get(CONF_PROFILE_SETUP, DEFAULT_PROFILE_SETUP),
     )
+    fleet = hass.data[DOMAIN].setdefault("fleet", FleetPipeline(hass))
+    with profiler.phase("transport"):
+        transport = await _async_create_transport(hass, entry)
+
+    with profiler.phase("coordinator"):
+        api = FCUApi(
+            entry.data["ip_address"],
+            entry.data["name"],
+            decoder=fleet.async_decode,
+            transport=transport,
+            latency=LatencyTracker(
+                entry.options.get(CONF_TIMEOUT_FLOOR, DEFAULT_TIMEOUT_FLOOR),
+                entry.options.get(CONF_TIMEOUT_CEILING, DEFAULT_TIMEOUT_CEILING),
+            ),
+        )
+        api.scheduler.async_start(hass)
+
+        coordinator = DataUpdateCoordinator(
+            hass,
+            _LOGGER,
+            name=entry.data["name"],
+            update_method=api.async_fetch_status,
+            update_interval=timedelta(seconds=30),  # Update every 30 seconds
+        )
+    thermal = ThermalModel(hass, entry.entry_id)
+    energy = EnergyMeter(hass, entry.entry_id)
+    lifecycle = EntryLifecycle(hass, entry.data["name"], api)
+    memory = ModeMemory(hass, entry.entry_id, coordinator, lifecycle)
 
     try:
-        # Do initial refresh
-        await coordinator.async_refresh()
+        # Do initial refresh while the stored models load
+        await asyncio.gather(
+            profiler.async_timed("first_refresh", coordinator.async_refresh()),
+            profiler.async_timed("thermal_load", thermal.async_load()),
+            profiler.async_timed("energy_load", energy.async_load()),
+            profiler.async_timed("staged_load", memory.async_load()),
+        )
     except Exception as ex:
         _LOGGER.error("Failed to fetch initial data: %s", ex)
+        await api.scheduler.async_stop()
+        await api.async_close()
         raise ConfigEntryNotReady from ex
 
+    # Learn the unit's thermal response from every poll
+    entry.async_on_unload(
+        coordinator.async_add_listener(lambda: thermal.add_sample(coordinator.data))
+    )
+
+    # Accumulate runtime and energy, before the sensors read the totals
+    entry.async_on_unload(
+        coordinator.async_add_listener(
+            lambda: energy.add_sample(coordinator.data, entry.options)
+        )
+    )
+
+    # Write staged setpoints once the unit runs in their mode, however it got there
+    entry.async_on_unload(coordinator.async_add_listener(memory.async_handle_update))
+
+    # Share water temperature analysis with the other units on the loop
+    loop = None
+    loop_name = entry.options.get(CONF_LOOP_GROUP, DEFAULT_LOOP_GROUP).strip()
+    if loop_name:
+        loop, leave_loop = async_join_loop(
+            hass, hass.data[DOMAIN].setdefault("loops", {}), loop_name, entry.entry_id, coordinator
+        )
+        entry.async_on_unload(leave_loop)
+
     hass.data[DOMAIN][entry.entry_id] = {
         "coordinator": coordinator,
+        "api": api,
         "name": entry.data["name"],
         "ip_address": entry.data["ip_address"],
+        "thermal": thermal,
+        "energy": energy,
+        "lifecycle": lifecycle,
+        "memory": memory,
+        "profiler": profiler,
+        "loop": loop,
+        "loop_aggregate_only": loop is not None and entry.options.get(
+            CONF_LOOP_AGGREGATE_ONLY, DEFAULT_LOOP_AGGREGATE_ONLY
+        ),
+        "options": dict(entry.options),
+        "mqtt": None,
     }
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(update_listener))
+
+    async def _async_stop(event: Event) -> None:
+        """Close the controller connection, entries are not unloaded on stop."""
+        data = hass.data[DOMAIN].get(entry.entry_id)
+        if data:
+            await _async_shutdown(data)
+
+    entry.async_on_unload(hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_stop))
+    with profiler.phase("platforms"):
+        # Forward the platforms together but time each one, entity
+        # additions included, as its own phase
+        await asyncio.gather(*(
+            profiler.async_timed(
+                f"platform_{platform}",
+                hass.config_entries.async_forward_entry_setups(entry, [platform]),
+            )
+            for platform in PLATFORMS
+        ))
+
+    if entry.options.get(CONF_MQTT_BRIDGE, DEFAULT_MQTT_BRIDGE):
+        from .mqtt_bridge import MqttBridge
+
+        bridge = MqttBridge(
+            hass,
+            entry.entry_id,
+            coordinator,
+            api,
+            lifecycle,
+            entry.options.get(CONF_MQTT_TOPIC, DEFAULT_MQTT_TOPIC)
+            or f"{DOMAIN}/{slugify(entry.data['name'])}",
+        )
+        # Waiting for the MQTT client must not hold up the entry
+        lifecycle.async_create_task(bridge.async_start())
+        hass.data[DOMAIN][entry.entry_id]["mqtt"] = bridge
+
+    profiler.finish()
     return True
 
+async def _async_flush_staged(data) -> None:
+    """Send setpoint and fan changes still waiting for their batch."""
+    flush = data["memory"].async_flush()
+    if flush is not None:
+        await asyncio.gather(flush, return_exceptions=True)
+
+async def _async_shutdown(data) -> None:
+    """Stop the bridge, then drain and close the entry's device work."""
+    if data["mqtt"] is not None:
+        data["mqtt"].async_stop()
+    await _async_flush_staged(data)
+    await data["lifecycle"].async_shutdown()
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    data = hass.data[DOMAIN].get(entry.entry_id)
+    if data:
+        # The batched write goes through the climate entity, so send it
+        # before the platforms are unloaded
+        await _async_flush_staged(data)
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        data = hass.data[DOMAIN].pop(entry.entry_id, None)
+        if data:
+            await _async_shutdown(data)
+            await data["thermal"].async_save()
+            await data["energy"].async_save()
+            await data["memory"].async_save()
+    return unload_ok
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove persisted data for a deleted entry."""
+    await ThermalModel(hass, entry.entry_id).async_remove()
+    await EnergyMeter(hass, entry.entry_id).async_remove()
+    await ModeMemory(hass, entry.entry_id, None, None).async_remove()
 
 async def update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle options update."""
+    data = hass.data[DOMAIN].get(entry.entry_id)
+    if data is not None:
+        changed = {
+            key
+            for key in set(entry.options) | set(data["options"])
+            if entry.options.get(key) != data["options"].get(key)
+        }
+        if changed <= LIVE_OPTIONS:
+            _LOGGER.debug("Applied options %s without reload", sorted(changed))
+            data["options"] = dict(entry.options)
+            return
     await hass.config_entries.async_reload(entry.entry_id)
\ No newline at end of file
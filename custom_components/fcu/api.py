@@ -0,0 +1,247 @@
+"""HTTP client for the FCU controller."""
+import asyncio
+import logging
+import time
+
+import aiohttp
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from .const import DEFAULT_TIMEOUT_FLOOR, DEFAULT_TIMEOUT_CEILING
+from .latency import LatencyTracker
+from .parsing import parse_payload, parse_status
+from .scheduler import (
+    RequestScheduler,
+    SchedulerClosedError,
+    PRIORITY_CONTROL,
+    PRIORITY_CONFIRM,
+    PRIORITY_POLL,
+    PRIORITY_DIAGNOSTIC,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STATUS_ENDPOINT = "/wifi/shortstatus"
+CONTROL_ENDPOINT = "/wifi/setmodenoauth"
+EXTRACONFIG_ENDPOINT = "/wifi/extraconfig"
+
+DEFAULT_TIMEOUT = 8  # seconds
+FORM_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+
+# Per-mode snapshot keys written by a control command, by device mode
+MODE_SETPOINT_KEYS = {"1": "required_temp_cooling", "2": "required_temp_heating"}
+MODE_FAN_KEYS = {
+    "1": "fan_state_current_cooling",
+    "2": "fan_state_current_heating",
+    "3": "fan_state_current_fan",
+}
+FAN_SPEEDS = {"0": "low", "1": "medium", "2": "high", "3": "auto"}
+
+
+def parse_control_ack(text, params):
+    """Return the status fields confirmed by a control reply, or None.
+
+    Firmware that answers with a status body is used as is. Firmware that
+    echoes the ``required_*`` form fields is mapped onto the snapshot keys
+    those fields control. Anything else does not confirm the write.
+    """
+    try:
+        # No defaults: keys missing from a partial echo must not overwrite
+        # the device_status and error_index of the current snapshot
+        reply = parse_payload(text)
+    except ValueError:
+        return None
+    if "operation_mode" in reply:
+        return reply
+    if "required_mode" not in reply:
+        return None
+
+    mode = str(reply["required_mode"])
+    if mode != str(params.get("required_mode")):
+        _LOGGER.debug("Control reply mode %s does not match request %s", mode, params)
+        return None
+    ack = {"operation_mode": mode}
+    if mode in MODE_SETPOINT_KEYS and "required_temp" in reply:
+        ack[MODE_SETPOINT_KEYS[mode]] = reply["required_temp"]
+    if mode in MODE_FAN_KEYS and "required_speed" in reply:
+        ack[MODE_FAN_KEYS[mode]] = str(reply["required_speed"])
+    return ack
+
+
+class HttpTransport:
+    """Send requests to a controller over HTTP."""
+
+    def __init__(self, ip_address):
+        """Initialize the transport."""
+        self._ip_address = ip_address
+        self._session = None
+
+    async def async_post(self, endpoint, data=None, timeout=DEFAULT_TIMEOUT):
+        """POST to an endpoint and return the status code and body."""
+        if self._session is None or self._session.closed:
+            # One connection, closed after every request: the controllers
+            # do not handle keep-alive
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=1, force_close=True)
+            )
+        async with self._session.post(
+            f"http://{self._ip_address}{endpoint}",
+            data=data,
+            headers=FORM_HEADERS if data is not None else None,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        ) as response:
+            return response.status, await response.text()
+
+    async def async_close(self):
+        """Close the HTTP session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+class FCUApi:
+    """Talk to one FCU controller.
+
+    Every request goes through the controller's RequestScheduler, so user
+    writes are never stuck behind a poll.
+    """
+
+    def __init__(self, ip_address, name=None, decoder=None, transport=None, latency=None):
+        """Initialize the client.
+
+        decoder, when given, is an async callable used to parse polled
+        status payloads, such as FleetPipeline.async_decode. transport defaults
+        to HTTP; the replay module provides recording and replaying ones.
+        latency sets the request deadlines from observed response times.
+        """
+        self._ip_address = ip_address
+        self._decoder = decoder
+        self._transport = transport or HttpTransport(ip_address)
+        self._latency = latency or LatencyTracker(
+            DEFAULT_TIMEOUT_FLOOR, DEFAULT_TIMEOUT_CEILING
+        )
+        self._scheduler = RequestScheduler(name or ip_address)
+        self._snapshot = {}
+        self._write_listeners = []
+
+    @property
+    def ip_address(self):
+        """Return the controller address."""
+        return self._ip_address
+
+    @property
+    def scheduler(self):
+        """Return the request scheduler."""
+        return self._scheduler
+
+    @property
+    def latency(self):
+        """Return the latency tracker."""
+        return self._latency
+
+    async def async_post(self, endpoint, data=None, timeout=None):
+        """POST to an endpoint and return the status code and body.
+
+        Without an explicit timeout, reads get the poll deadline and
+        writes the write deadline of this controller.
+        """
+        if timeout is None:
+            timeout = (
+                self._latency.poll_deadline()
+                if data is None
+                else self._latency.write_deadline()
+            )
+        started = time.monotonic()
+        try:
+            result = await self._transport.async_post(endpoint, data, timeout)
+        except asyncio.TimeoutError:
+            self._latency.observe_timeout(timeout)
+            raise
+        self._latency.observe(time.monotonic() - started)
+        return result
+
+    async def async_close(self):
+        """Close the transport."""
+        await self._transport.async_close()
+
+    async def _async_read_status(self, decoder=None):
+        """Read and parse the short status."""
+        status, text = await self.async_post(STATUS_ENDPOINT)
+        _LOGGER.debug("Raw response: %s", text)
+        if status != 200:
+            raise UpdateFailed(f"Error {status}")
+        if decoder is not None:
+            parsed_data = await decoder(text)
+        else:
+            parsed_data = parse_status(text)
+        _LOGGER.debug("Parsed data: %s", parsed_data)
+        self._snapshot = parsed_data
+        return parsed_data
+
+    async def _async_poll_status(self):
+        """Read the short status, decoding it with the fleet's polls.
+
+        Only polls are batched: confirming reads are parsed inline so a
+        user write never waits for the batch window.
+        """
+        return await self._async_read_status(self._decoder)
+
+    async def _async_write(self, params):
+        """Send a control command and return the resulting status.
+
+        The confirming read, when the reply does not carry the new state,
+        runs in the same scheduler slot so no poll can slip in between.
+        """
+        status, text = await self.async_post(CONTROL_ENDPOINT, data=params)
+        _LOGGER.debug("Response: %s", text)
+        if status != 200:
+            raise UpdateFailed(f"Control failed: {status} - {text}")
+        ack = parse_control_ack(text, params)
+        if ack is None:
+            return await self._async_read_status()
+        # The controller echoed its new state, no read needed
+        self._snapshot = {**self._snapshot, **ack}
+        return self._snapshot
+
+    async def async_fetch_status(self):
+        """Fetch the short status as a periodic poll."""
+        _LOGGER.debug("Fetching data from %s", self._ip_address)
+        try:
+            return await self._scheduler.async_submit(
+                PRIORITY_POLL, self._async_poll_status, skippable=True
+            )
+        except SchedulerClosedError as ex:
+            raise UpdateFailed(str(ex)) from ex
+        except Exception as ex:
+            _LOGGER.error("Error fetching data: %s", str(ex))
+            raise
+
+    async def async_confirm_status(self):
+        """Fetch the short status ahead of periodic polls."""
+        return await self._scheduler.async_submit(PRIORITY_CONFIRM, self._async_read_status)
+
+    def async_add_write_listener(self, listener):
+        """Call listener(params, state, error) after every control write."""
+        self._write_listeners.append(listener)
+        return lambda: self._write_listeners.remove(listener)
+
+    async def async_send_control(self, params):
+        """Send a control command and return the device state after it."""
+        try:
+            state = await self._scheduler.async_submit(
+                PRIORITY_CONTROL, lambda: self._async_write(params)
+            )
+        except Exception as ex:
+            for listener in list(self._write_listeners):
+                listener(params, None, ex)
+            raise
+        for listener in list(self._write_listeners):
+            listener(params, state, None)
+        return state
+
+    async def async_send_extraconfig(self, params):
+        """Send extra configuration and return the HTTP status."""
+        status, _ = await self._scheduler.async_submit(
+            PRIORITY_DIAGNOSTIC,
+            lambda: self.async_post(EXTRACONFIG_ENDPOINT, data=params),
+        )
+        return status
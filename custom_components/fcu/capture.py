@@ -0,0 +1,50 @@
+"""Capture files written by the recording transport.
+
+One exchange per line, keys kept short to keep captures compact:
+  t      seconds since the capture started
+  ep     endpoint, e.g. /wifi/shortstatus
+  req    form data sent, or null
+  ms     response time in milliseconds
+  st/b   HTTP status and body, or
+  err    the exception type when the request failed, and
+  to     true when that exception was a timeout
+
+Kept free of Home Assistant imports so offline tools such as
+scripts/replay_capture.py can load it on its own.
+"""
+import asyncio
+import json
+import logging
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def read_capture(path):
+    """Read a capture file."""
+    records = []
+    with open(path, encoding="utf-8") as capture:
+        for number, line in enumerate(capture, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                _LOGGER.warning("Skipping corrupt line %d in %s", number, path)
+    return records
+
+
+async def async_iter_capture(records, speed=1.0):
+    """Yield recorded exchanges at their recorded pace divided by speed.
+
+    Used by scripts/replay_capture.py to benchmark and regression-check
+    parsing offline.
+    """
+    start = time.monotonic()
+    for record in records:
+        if speed:
+            delay = start + record["t"] / speed - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        yield record
@@ -11,12 +11,9 @@ from homeassistant.const import (
 from homeassistant.core import callback  # Add this import
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-import aiohttp
-import asyncio
 import logging
 from datetime import timedelta, datetime
-from homeassistant.core import CALLBACK_TYPE
-from homeassistant.helpers.event import async_track_time_interval
+from .api import MODE_FAN_KEYS, MODE_SETPOINT_KEYS
 from .const import DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
@@ -43,7 +40,6 @@ async def log_with_throttle(logger, level, msg, *args):
 HVAC_MODES = [HVACMode.OFF, HVACMode.COOL, HVACMode.HEAT, HVACMode.FAN_ONLY]
 FAN_MODES = ["low", "medium", "high", "auto"]
 
-TIMEOUT = 15  # seconds  (increase from 10 to 15, or higher if needed)
 CONTENT_TYPE_JSON = "application/json"
 COMMON_HEADERS = {
     "X-Requested-With": "myApp",
@@ -59,20 +55,37 @@ async def async_setup_entry(hass, entry, async_add_entities):
     """Set up FCU climate based on config_entry."""
     data = hass.data[DOMAIN][entry.entry_id]
     coordinator = data["coordinator"]
-    climate = FCUClimate(coordinator, entry.entry_id, data["name"], data["ip_address"])
+    climate = FCUClimate(
+        coordinator,
+        entry.entry_id,
+        data["name"],
+        data["api"],
+        thermal=data["thermal"],
+        lifecycle=data["lifecycle"],
+        memory=data["memory"],
+        publish_water_temp=not data["loop_aggregate_only"],
+    )
     async_add_entities([climate])
     return True
 
 class FCUClimate(CoordinatorEntity, ClimateEntity, RestoreEntity):
     """Representation of a fan coil unit as a climate entity."""
 
-    def __init__(self, coordinator, entry_id, name, ip_address):
+    def __init__(
+        self, coordinator, entry_id, name, api, thermal=None, lifecycle=None, memory=None,
+        publish_water_temp=True,
+    ):
         """Initialize the climate entity."""
         super().__init__(coordinator)
         self._attr_unique_id = f"{entry_id}_climate"
         self._name = name
-        self._ip_address = ip_address
+        self._api = api
+        self._ip_address = api.ip_address
         self._entry_id = entry_id
+        self._thermal = thermal
+        self._lifecycle = lifecycle
+        self._memory = memory
+        self._publish_water_temp = publish_water_temp
         self._temperature = None
         self._water_temp = None
         self._error_index = None
@@ -94,6 +107,8 @@ class FCUClimate(CoordinatorEntity, ClimateEntity, RestoreEntity):
         self._attr_max_temp = 30
         self._attr_precision = 0.5
         self._last_update = None
+        self._last_written = None
+        self._precondition_task = None
 
     async def async_added_to_hass(self):
         """Run when entity about to be added."""
@@ -117,8 +132,45 @@ class FCUClimate(CoordinatorEntity, ClimateEntity, RestoreEntity):
             if last_state.attributes.get(f"{self._name}_fan_mode_fan"):
                 self._fan_mode_fan = last_state.attributes[f"{self._name}_fan_mode_fan"]
         
-        # Force initial update
-        await self.async_update()
+        # Start from the coordinator's first refresh instead of fetching
+        # again, which keeps an extra request off every unit's setup path
+        if self.coordinator.data:
+            self._parse_device_state(self.coordinator.data)
+        else:
+            await self.async_update()
+        profiler = self.hass.data[DOMAIN][self._entry_id].get("profiler")
+        if profiler is not None:
+            profiler.mark("first_entity_added")
+
+        # Expose the write path to the rest of the integration
+        self.hass.data[DOMAIN][self._entry_id]["climate"] = self
+
+    async def async_will_remove_from_hass(self):
+        """Run when entity will be removed."""
+        await super().async_will_remove_from_hass()
+        self.hass.data[DOMAIN].get(self._entry_id, {}).pop("climate", None)
+
+    async def async_apply_command(self, command):
+        """Apply a combined hvac_mode/temperature/fan_mode command in one write."""
+        control_data = {}
+        if "hvac_mode" in command:
+            if command["hvac_mode"] not in HVAC_MODES:
+                raise ValueError(f"Unsupported HVAC mode: {command['hvac_mode']}")
+            control_data["hvac_mode"] = HVACMode(command["hvac_mode"])
+        if "temperature" in command:
+            temp = float(command["temperature"])
+            if temp < self._attr_min_temp or temp > self._attr_max_temp:
+                raise ValueError(
+                    f"Temperature {temp} out of range [{self._attr_min_temp}, {self._attr_max_temp}]"
+                )
+            control_data["temperature"] = temp
+        if "fan_mode" in command:
+            if command["fan_mode"] not in FAN_MODES:
+                raise ValueError(f"Unsupported fan mode: {command['fan_mode']}")
+            control_data["fan_mode"] = command["fan_mode"]
+        if not control_data:
+            raise ValueError(f"Empty command: {command}")
+        await self._send_control_command(control_data)
 
     async def async_update(self):
         """Fetch new state data for the entity."""
@@ -130,43 +182,9 @@ class FCUClimate(CoordinatorEntity, ClimateEntity, RestoreEntity):
 
     async def _fetch_device_state(self):
         """Fetch the current state of the device."""
-        status_url = f"http://{self._ip_address}/wifi/shortstatus"
-
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    status_url,
-                    timeout=aiohttp.ClientTimeout(total=TIMEOUT),
-                ) as response:
-                    text = await response.text()
-                    _LOGGER.debug("Raw response from %s: %s", self._name, text)
-                    
-                    if response.status == 200:
-                        try:
-                            # Try to parse as JSON
-                            data = text.replace("'", '"')  # Replace single quotes with double quotes
-                            import json
-                            try:
-                                data = json.loads(data)
-                            except json.JSONDecodeError:
-                                # If JSON fails, try eval (response might be a Python dict string)
-                                import ast
-                                data = ast.literal_eval(text)
-                            
-                            if isinstance(data, dict):
-                                self._parse_device_state(data)
-                                return
-                            else:
-                                _LOGGER.error("Invalid data format for %s: %s", self._name, text)
-                        except Exception as e:
-                            _LOGGER.error("Failed to parse response for %s: %s. Response: %s", 
-                                        self._name, str(e), text)
-                    else:
-                        _LOGGER.warning(
-                            "Failed to fetch state for %s: %s", 
-                            self._name, response.status
-                        )
-
+            data = await self._api.async_confirm_status()
+            self._parse_device_state(data)
         except Exception as err:
             _LOGGER.error("Error fetching state for %s: %s", self._name, str(err))
 
@@ -377,6 +395,9 @@ class FCUClimate(CoordinatorEntity, ClimateEntity, RestoreEntity):
     @property
     def extra_state_attributes(self):
         """Return device-specific state attributes."""
+        if not self._publish_water_temp:
+            # Recorded once per loop by the loop aggregate sensor instead
+            return {"error_index": self.coordinator.data.get("error_index")}
         return {
             "water_temperature": self.coordinator.data.get("wt"),
             "error_index": self.coordinator.data.get("error_index"),
@@ -441,10 +462,53 @@ class FCUClimate(CoordinatorEntity, ClimateEntity, RestoreEntity):
                     "Coordinator set hvac_action for %s: %s (mode=%s, device_status=%s, current_temp=%s, target_temp=%s)",
                     self._name, self._hvac_action, self._hvac_mode, device_status, current_temp, target_temp
                 )
-                self.async_write_ha_state()
+                state = (
+                    self._temperature,
+                    self._target_temperature,
+                    self._hvac_mode,
+                    self._hvac_action,
+                    self._fan_mode,
+                    self.coordinator.data.get("wt") if self._publish_water_temp else None,
+                    self.coordinator.data.get("error_index"),
+                )
+                # Skip the write when nothing visible changed
+                if state != self._last_written:
+                    self._last_written = state
+                    self.async_write_ha_state()
+                self._check_precondition()
             except Exception as ex:
                 _LOGGER.error("Error handling coordinator update: %s", ex)
 
+    @callback
+    def _check_precondition(self) -> None:
+        """Start the unit early so it reaches setpoint at occupancy."""
+        if self._thermal is None or self._lifecycle is None:
+            return
+        if self._precondition_task is not None and not self._precondition_task.done():
+            return
+        entry = self.hass.config_entries.async_get_entry(self._entry_id)
+        if entry is None:
+            return
+        mode = self._thermal.precondition_mode(self.coordinator.data, entry.options)
+        if mode is None:
+            return
+        hvac_mode = self._map_operation_mode(mode)
+        target_key = (
+            "required_temp_heating" if hvac_mode == HVACMode.HEAT else "required_temp_cooling"
+        )
+        _LOGGER.info("Pre-conditioning %s ahead of occupancy", self._name)
+        self._precondition_task = self._lifecycle.async_create_task(
+            self._async_precondition({
+                "hvac_mode": hvac_mode,
+                "temperature": float(self.coordinator.data[target_key]),
+            })
+        )
+
+    async def _async_precondition(self, control_data):
+        """Start pre-conditioning; only a successful write counts for the day."""
+        if await self._send_control_command(control_data):
+            self._thermal.mark_preconditioned()
+
     async def _async_update_from_data(self, data):
         """Update attrs from data."""
         if not data:
@@ -507,9 +571,26 @@ class FCUClimate(CoordinatorEntity, ClimateEntity, RestoreEntity):
         })
 
     async def _send_control_command(self, control_data):
-        """Send control command to the device."""
+        """Send control command to the device and return True on success."""
         try:
-            # First determine the temperature to send
+            # Switching modes: send the setpoint and fan speed that mode
+            # remembers, including changes staged while it was inactive
+            new_mode = control_data.get("hvac_mode", self._hvac_mode)
+            device_mode = self._reverse_map_hvac_mode(new_mode)
+            if self._memory is not None and new_mode != self._hvac_mode and device_mode in MODE_FAN_KEYS:
+                remembered = {}
+                if device_mode in MODE_SETPOINT_KEYS and self._memory.setpoint(device_mode) is not None:
+                    remembered["temperature"] = self._memory.setpoint(device_mode)
+                if self._memory.fan_mode(device_mode) is not None:
+                    remembered["fan_mode"] = self._memory.fan_mode(device_mode)
+                self._memory.pop_staged(device_mode)
+                control_data = {**remembered, **control_data}
+
+            # Update mode if provided
+            if "hvac_mode" in control_data:
+                self._hvac_mode = control_data["hvac_mode"]
+
+            # Then determine the temperature to send
             if "temperature" in control_data:
                 temp = str(control_data["temperature"])
                 # Update local temps
@@ -527,10 +608,6 @@ class FCUClimate(CoordinatorEntity, ClimateEntity, RestoreEntity):
                 else:
                     temp = str(self._target_temperature if self._target_temperature is not None else 22)
 
-            # Update mode if provided
-            if "hvac_mode" in control_data:
-                self._hvac_mode = control_data["hvac_mode"]
-
             # Update fan mode if provided
             if "fan_mode" in control_data:
                 self._fan_mode = control_data["fan_mode"]
@@ -543,23 +620,14 @@ class FCUClimate(CoordinatorEntity, ClimateEntity, RestoreEntity):
             }
 
             _LOGGER.debug("Sending control command: %s", device_params)
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"http://{self._ip_address}/wifi/setmodenoauth",
-                    data=device_params,
-                    headers={"Content-Type": "application/x-www-form-urlencoded"},
-                    timeout=aiohttp.ClientTimeout(total=8)
-                ) as response:
-                    response_text = await response.text()
-                    _LOGGER.debug("Response: %s", response_text)
-                    if response.status == 200:
-                        await self.coordinator.async_refresh()
-                    else:
-                        _LOGGER.error("Control failed: %s - %s", response.status, response_text)
+
+            data = await self._api.async_send_control(device_params)
+            self.coordinator.async_set_updated_data(data)
+            return True
 
         except Exception as err:
             _LOGGER.error("Failed to send control command: %s", str(err))
+            return False
 
     def set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Set new target hvac mode."""
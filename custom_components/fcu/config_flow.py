@@ -4,17 +4,39 @@ from homeassistant import config_entries
 from homeassistant.const import CONF_NAME, CONF_IP_ADDRESS
 from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
-import aiohttp
-import asyncio
 import logging
 
+from .api import FCUApi, EXTRACONFIG_ENDPOINT
 from .const import (
     DOMAIN, CONF_T1D, CONF_T2D, CONF_T3D, CONF_T4D, CONF_SHUTDOWN_DELAY,
-    DEFAULT_T1D, DEFAULT_T2D, DEFAULT_T3D, DEFAULT_T4D, DEFAULT_SHUTDOWN_DELAY
+    DEFAULT_T1D, DEFAULT_T2D, DEFAULT_T3D, DEFAULT_T4D, DEFAULT_SHUTDOWN_DELAY,
+    CONF_PRECONDITION, CONF_OCCUPANCY_START, CONF_PRECONDITION_MAX_LEAD,
+    DEFAULT_PRECONDITION, DEFAULT_OCCUPANCY_START, DEFAULT_PRECONDITION_MAX_LEAD,
+    CONF_MQTT_BRIDGE, CONF_MQTT_TOPIC, DEFAULT_MQTT_BRIDGE, DEFAULT_MQTT_TOPIC,
+    CONF_FAN_POWER_LOW, CONF_FAN_POWER_MEDIUM, CONF_FAN_POWER_HIGH,
+    CONF_COIL_CAPACITY_LOW, CONF_COIL_CAPACITY_MEDIUM, CONF_COIL_CAPACITY_HIGH,
+    DEFAULT_FAN_POWER, DEFAULT_COIL_CAPACITY,
+    CONF_CAPTURE_TRAFFIC, CONF_REPLAY_FILE, CONF_REPLAY_SPEED,
+    DEFAULT_CAPTURE_TRAFFIC, DEFAULT_REPLAY_FILE, DEFAULT_REPLAY_SPEED,
+    CONF_TIMEOUT_FLOOR, CONF_TIMEOUT_CEILING, DEFAULT_TIMEOUT_FLOOR, DEFAULT_TIMEOUT_CEILING,
+    CONF_PROFILE_SETUP, DEFAULT_PROFILE_SETUP,
+    CONF_LOOP_GROUP, CONF_LOOP_AGGREGATE_ONLY, DEFAULT_LOOP_GROUP, DEFAULT_LOOP_AGGREGATE_ONLY,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+EXTRACONFIG_KEYS = (CONF_T1D, CONF_T2D, CONF_T3D, CONF_T4D, CONF_SHUTDOWN_DELAY)
+
+def _extraconfig_params(values):
+    """Format the device configuration for the form-urlencoded request."""
+    return {
+        't1d': "{:.1f}".format(float(values[CONF_T1D])),
+        't2d': "{:.1f}".format(float(values[CONF_T2D])),
+        't3d': "{:.1f}".format(float(values[CONF_T3D])),
+        't4d': "{:.1f}".format(float(values[CONF_T4D])),
+        'shutdown_delay': str(int(values[CONF_SHUTDOWN_DELAY]))
+    }
+
 class FCUConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for FCU."""
 
@@ -56,34 +78,56 @@ class FCUOptionsFlow(config_entries.OptionsFlow):
         self.config_entry = config_entry
         self._ip_address = config_entry.data[CONF_IP_ADDRESS]
 
+    def _extraconfig_changed(self, params):
+        """Return True when the device configuration differs from the saved one."""
+        stored = self.config_entry.options
+        if not all(key in stored for key in EXTRACONFIG_KEYS):
+            # Never sent from here, so the device may not have these yet
+            return True
+        return params != _extraconfig_params(stored)
+
     async def async_step_init(self, user_input=None):
         """Handle options flow."""
-        if user_input is not None:
-            # Format the data for form-urlencoded request
-            params = {
-                't1d': "{:.1f}".format(float(user_input[CONF_T1D])),
-                't2d': "{:.1f}".format(float(user_input[CONF_T2D])),
-                't3d': "{:.1f}".format(float(user_input[CONF_T3D])),
-                't4d': "{:.1f}".format(float(user_input[CONF_T4D])),
-                'shutdown_delay': str(int(user_input[CONF_SHUTDOWN_DELAY]))
-            }
-            
+        errors = {}
+        if user_input is not None and user_input.get(
+            CONF_TIMEOUT_CEILING, DEFAULT_TIMEOUT_CEILING
+        ) < user_input.get(CONF_TIMEOUT_FLOOR, DEFAULT_TIMEOUT_FLOOR):
+            errors[CONF_TIMEOUT_CEILING] = "timeout_range"
+        elif user_input is not None:
+            params = _extraconfig_params(user_input)
+            if not self._extraconfig_changed(params):
+                # Nothing to push to the device, so no round trip
+                return self.async_create_entry(title="", data=user_input)
+            if user_input.get(CONF_REPLAY_FILE, DEFAULT_REPLAY_FILE):
+                _LOGGER.warning(
+                    "Not sending the device configuration to %s while replaying a capture",
+                    self._ip_address,
+                )
+                return self.async_create_entry(title="", data=user_input)
+
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                        f"http://{self._ip_address}/wifi/extraconfig",
-                        data=params,
-                        headers={"Content-Type": "application/x-www-form-urlencoded"},
-                        timeout=aiohttp.ClientTimeout(total=5)
-                    ) as response:
-                        if response.status == 200:
-                            _LOGGER.debug(
-                                "Config update success: %s with data: %s",
-                                self._ip_address,
-                                "&".join(f"{k}={v}" for k, v in params.items())
-                            )
-                            return self.async_create_entry(title="", data=user_input)
-                        _LOGGER.error("Failed to update config: %s", response.status)
+                entry_data = self.hass.data.get(DOMAIN, {}).get(self.config_entry.entry_id)
+                # A replaying entry cannot reach the controller; the save
+                # that turns replay off goes to the device directly
+                if entry_data and not self.config_entry.options.get(
+                    CONF_REPLAY_FILE, DEFAULT_REPLAY_FILE
+                ):
+                    # Queue behind user writes on the running controller
+                    status = await entry_data["api"].async_send_extraconfig(params)
+                else:
+                    api = FCUApi(self._ip_address)
+                    try:
+                        status, _ = await api.async_post(EXTRACONFIG_ENDPOINT, data=params)
+                    finally:
+                        await api.async_close()
+                if status == 200:
+                    _LOGGER.debug(
+                        "Config update success: %s with data: %s",
+                        self._ip_address,
+                        "&".join(f"{k}={v}" for k, v in params.items())
+                    )
+                    return self.async_create_entry(title="", data=user_input)
+                _LOGGER.error("Failed to update config: %s", status)
             except Exception as ex:
                 _LOGGER.error("Error updating config: %s", ex)
 
@@ -108,6 +152,76 @@ class FCUOptionsFlow(config_entries.OptionsFlow):
                 CONF_SHUTDOWN_DELAY,
                 default=self.config_entry.options.get(CONF_SHUTDOWN_DELAY, DEFAULT_SHUTDOWN_DELAY)
             ): vol.All(vol.Coerce(int), vol.Range(min=0, max=60000)),
+            vol.Required(
+                CONF_PRECONDITION,
+                default=self.config_entry.options.get(CONF_PRECONDITION, DEFAULT_PRECONDITION)
+            ): bool,
+            vol.Required(
+                CONF_OCCUPANCY_START,
+                default=self.config_entry.options.get(CONF_OCCUPANCY_START, DEFAULT_OCCUPANCY_START)
+            ): vol.Match(r"^([01]\d|2[0-3]):[0-5]\d$"),
+            vol.Required(
+                CONF_PRECONDITION_MAX_LEAD,
+                default=self.config_entry.options.get(
+                    CONF_PRECONDITION_MAX_LEAD, DEFAULT_PRECONDITION_MAX_LEAD
+                )
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=360)),
+            vol.Required(
+                CONF_MQTT_BRIDGE,
+                default=self.config_entry.options.get(CONF_MQTT_BRIDGE, DEFAULT_MQTT_BRIDGE)
+            ): bool,
+            vol.Optional(
+                CONF_MQTT_TOPIC,
+                default=self.config_entry.options.get(CONF_MQTT_TOPIC, DEFAULT_MQTT_TOPIC)
+            ): str,
+        })
+        for key in (CONF_FAN_POWER_LOW, CONF_FAN_POWER_MEDIUM, CONF_FAN_POWER_HIGH):
+            schema = schema.extend({
+                vol.Required(
+                    key, default=self.config_entry.options.get(key, DEFAULT_FAN_POWER)
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.0, max=1000.0)),
+            })
+        for key in (CONF_COIL_CAPACITY_LOW, CONF_COIL_CAPACITY_MEDIUM, CONF_COIL_CAPACITY_HIGH):
+            schema = schema.extend({
+                vol.Required(
+                    key, default=self.config_entry.options.get(key, DEFAULT_COIL_CAPACITY)
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.0, max=50.0)),
+            })
+        schema = schema.extend({
+            vol.Required(
+                CONF_CAPTURE_TRAFFIC,
+                default=self.config_entry.options.get(CONF_CAPTURE_TRAFFIC, DEFAULT_CAPTURE_TRAFFIC)
+            ): bool,
+            vol.Optional(
+                CONF_REPLAY_FILE,
+                default=self.config_entry.options.get(CONF_REPLAY_FILE, DEFAULT_REPLAY_FILE)
+            ): str,
+            vol.Required(
+                CONF_REPLAY_SPEED,
+                default=self.config_entry.options.get(CONF_REPLAY_SPEED, DEFAULT_REPLAY_SPEED)
+            ): vol.All(vol.Coerce(float), vol.Range(min=0.0, max=1000.0)),
+            vol.Required(
+                CONF_TIMEOUT_FLOOR,
+                default=self.config_entry.options.get(CONF_TIMEOUT_FLOOR, DEFAULT_TIMEOUT_FLOOR)
+            ): vol.All(vol.Coerce(float), vol.Range(min=0.5, max=30.0)),
+            vol.Required(
+                CONF_TIMEOUT_CEILING,
+                default=self.config_entry.options.get(CONF_TIMEOUT_CEILING, DEFAULT_TIMEOUT_CEILING)
+            ): vol.All(vol.Coerce(float), vol.Range(min=1.0, max=60.0)),
+            vol.Required(
+                CONF_PROFILE_SETUP,
+                default=self.config_entry.options.get(CONF_PROFILE_SETUP, DEFAULT_PROFILE_SETUP)
+            ): bool,
+            vol.Optional(
+                CONF_LOOP_GROUP,
+                default=self.config_entry.options.get(CONF_LOOP_GROUP, DEFAULT_LOOP_GROUP)
+            ): str,
+            vol.Required(
+                CONF_LOOP_AGGREGATE_ONLY,
+                default=self.config_entry.options.get(
+                    CONF_LOOP_AGGREGATE_ONLY, DEFAULT_LOOP_AGGREGATE_ONLY
+                )
+            ): bool,
         })
 
-        return self.async_show_form(step_id="init", data_schema=schema)
\ No newline at end of file
+        return self.async_show_form(step_id="init", data_schema=schema, errors=errors)
\ No newline at end of file
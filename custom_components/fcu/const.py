@@ -4,7 +4,7 @@ from homeassistant.const import Platform
 from datetime import timedelta
 
 DOMAIN = "fcu"
-PLATFORMS = [Platform.CLIMATE, Platform.SENSOR]
+PLATFORMS = [Platform.CLIMATE, Platform.SENSOR, Platform.NUMBER, Platform.SELECT]
 
 # Add sensor constants
 DEVICE_STATUS_SENSOR = "device_status"
@@ -21,4 +21,59 @@ DEFAULT_T1D = 0.0
 DEFAULT_T2D = 0.0
 DEFAULT_T3D = 0.0
 DEFAULT_T4D = 0.0
-DEFAULT_SHUTDOWN_DELAY = 30000
\ No newline at end of file
+DEFAULT_SHUTDOWN_DELAY = 30000
+
+# Pre-conditioning ahead of scheduled occupancy
+CONF_PRECONDITION = "precondition"
+CONF_OCCUPANCY_START = "occupancy_start"
+CONF_PRECONDITION_MAX_LEAD = "precondition_max_lead"
+
+DEFAULT_PRECONDITION = False
+DEFAULT_OCCUPANCY_START = "08:00"
+DEFAULT_PRECONDITION_MAX_LEAD = 120  # minutes
+
+# MQTT bridge for consumers outside Home Assistant
+CONF_MQTT_BRIDGE = "mqtt_bridge"
+CONF_MQTT_TOPIC = "mqtt_topic"
+
+DEFAULT_MQTT_BRIDGE = False
+DEFAULT_MQTT_TOPIC = ""  # empty means fcu/<device name>
+
+# Energy accounting: fan electrical power (W) and coil capacity (kW) per speed
+CONF_FAN_POWER_LOW = "fan_power_low"
+CONF_FAN_POWER_MEDIUM = "fan_power_medium"
+CONF_FAN_POWER_HIGH = "fan_power_high"
+CONF_COIL_CAPACITY_LOW = "coil_capacity_low"
+CONF_COIL_CAPACITY_MEDIUM = "coil_capacity_medium"
+CONF_COIL_CAPACITY_HIGH = "coil_capacity_high"
+
+DEFAULT_FAN_POWER = 0.0
+DEFAULT_COIL_CAPACITY = 0.0
+
+# Traffic capture and replay
+CONF_CAPTURE_TRAFFIC = "capture_traffic"
+CONF_REPLAY_FILE = "replay_file"
+CONF_REPLAY_SPEED = "replay_speed"
+
+DEFAULT_CAPTURE_TRAFFIC = False
+DEFAULT_REPLAY_FILE = ""  # empty means talk to the controller
+DEFAULT_REPLAY_SPEED = 1.0
+
+# Request deadlines are derived from observed latency within these bounds
+CONF_TIMEOUT_FLOOR = "timeout_floor"
+CONF_TIMEOUT_CEILING = "timeout_ceiling"
+
+DEFAULT_TIMEOUT_FLOOR = 2.0  # seconds
+DEFAULT_TIMEOUT_CEILING = 15.0  # seconds
+
+# Setup profiling
+CONF_PROFILE_SETUP = "profile_setup"
+
+DEFAULT_PROFILE_SETUP = False
+
+# Hydronic loop grouping
+CONF_LOOP_GROUP = "loop_group"
+CONF_LOOP_AGGREGATE_ONLY = "loop_aggregate_only"
+
+DEFAULT_LOOP_GROUP = ""  # empty means the unit is not in a loop group
+DEFAULT_LOOP_AGGREGATE_ONLY = False
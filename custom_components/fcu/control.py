@@ -0,0 +1,123 @@
+"""Per-mode setpoint and fan memory with batched write-through."""
+import logging
+
+from homeassistant.core import callback
+from homeassistant.helpers.storage import Store
+
+from .api import FAN_SPEEDS, MODE_FAN_KEYS, MODE_SETPOINT_KEYS
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+BATCH_DELAY = 0.5  # seconds to gather changes into one write
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 10  # seconds
+
+
+class ModeMemory:
+    """Setpoint and fan speed the unit uses in each mode.
+
+    The controller only accepts a setpoint and fan speed together with the
+    mode to run in. Changes for the mode the unit is running in are
+    gathered for a moment and sent as one write through the climate
+    entity. Changes for any other mode are kept here and sent with the
+    write that switches the unit into that mode, or as soon as a poll
+    shows the unit running in it, for example after a switch at the wall
+    panel. They are stored, so a reload or restart does not lose them.
+    """
+
+    def __init__(self, hass, entry_id, coordinator, lifecycle):
+        """Initialize the memory."""
+        self._hass = hass
+        self._entry_id = entry_id
+        self._coordinator = coordinator
+        self._lifecycle = lifecycle
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.staged_{entry_id}")
+        self._staged = {}
+        self._flush_handle = None
+
+    async def async_load(self):
+        """Load the changes staged before a reload or restart."""
+        stored = await self._store.async_load()
+        if stored:
+            self._staged = stored.get("staged", {})
+
+    async def async_save(self):
+        """Persist the staged changes now."""
+        await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self):
+        """Remove the persisted changes."""
+        await self._store.async_remove()
+
+    def _data_to_save(self):
+        """Return the data to store."""
+        return {"staged": self._staged}
+
+    def setpoint(self, mode):
+        """Return the setpoint for a device mode."""
+        staged = self._staged.get(mode, {})
+        if "temperature" in staged:
+            return staged["temperature"]
+        value = (self._coordinator.data or {}).get(MODE_SETPOINT_KEYS[mode])
+        return float(value) if value is not None else None
+
+    def fan_mode(self, mode):
+        """Return the fan speed for a device mode."""
+        staged = self._staged.get(mode, {})
+        if "fan_mode" in staged:
+            return staged["fan_mode"]
+        value = (self._coordinator.data or {}).get(MODE_FAN_KEYS[mode])
+        return FAN_SPEEDS.get(str(value)) if value is not None else None
+
+    def is_staged(self, mode):
+        """Return True while a change for the mode has not been written."""
+        return bool(self._staged.get(mode))
+
+    def pop_staged(self, mode):
+        """Return and forget the staged changes for a device mode."""
+        staged = self._staged.pop(mode, {})
+        if staged:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        return staged
+
+    @callback
+    def async_stage(self, mode, **changes):
+        """Stage temperature and/or fan_mode changes for a device mode."""
+        self._staged.setdefault(mode, {}).update(changes)
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        current = str((self._coordinator.data or {}).get("operation_mode", "0"))
+        if mode != current:
+            _LOGGER.debug("Staged %s for mode %s until the unit switches to it", changes, mode)
+            return
+        if self._flush_handle is None:
+            self._flush_handle = self._hass.loop.call_later(BATCH_DELAY, self._flush)
+
+    @callback
+    def async_handle_update(self):
+        """Write what is staged for the mode the unit is now running in."""
+        current = str((self._coordinator.data or {}).get("operation_mode", "0"))
+        if self._staged.get(current) and self._flush_handle is None:
+            _LOGGER.debug("Unit entered mode %s, writing the changes staged for it", current)
+            self._flush_handle = self._hass.loop.call_later(BATCH_DELAY, self._flush)
+
+    @callback
+    def _flush(self):
+        """Write the changes for the current mode and return the task."""
+        self._flush_handle = None
+        current = str((self._coordinator.data or {}).get("operation_mode", "0"))
+        climate = self._hass.data[DOMAIN].get(self._entry_id, {}).get("climate")
+        if climate is None or not self._staged.get(current):
+            return None
+        return self._lifecycle.async_create_task(
+            climate.async_apply_command(self.pop_staged(current))
+        )
+
+    @callback
+    def async_flush(self):
+        """Start a pending batched write now and return its task, if any."""
+        if self._flush_handle is None:
+            return None
+        self._flush_handle.cancel()
+        return self._flush()
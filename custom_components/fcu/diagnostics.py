@@ -0,0 +1,24 @@
+"""Diagnostics support for FCU."""
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_IP_ADDRESS
+
+from .const import DOMAIN
+
+TO_REDACT = {CONF_IP_ADDRESS}
+
+async def async_get_config_entry_diagnostics(hass, entry):
+    """Return diagnostics for a config entry."""
+    data = hass.data[DOMAIN].get(entry.entry_id)
+    diagnostics = {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+    }
+    if data is None:
+        return diagnostics
+
+    diagnostics.update({
+        "status": data["coordinator"].data,
+        "last_update_success": data["coordinator"].last_update_success,
+        "latency": data["api"].latency.as_dict(),
+        "setup_profile": data["profiler"].as_dict(),
+    })
+    return diagnostics
@@ -0,0 +1,125 @@
+"""Runtime and energy accounting for FCU units."""
+import logging
+import time
+
+from homeassistant.helpers.storage import Store
+
+from .api import FAN_SPEEDS, MODE_FAN_KEYS
+from .const import (
+    DOMAIN,
+    CONF_FAN_POWER_LOW, CONF_FAN_POWER_MEDIUM, CONF_FAN_POWER_HIGH,
+    CONF_COIL_CAPACITY_LOW, CONF_COIL_CAPACITY_MEDIUM, CONF_COIL_CAPACITY_HIGH,
+    DEFAULT_FAN_POWER, DEFAULT_COIL_CAPACITY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 60  # seconds
+
+# Longer gaps are treated as an outage and not accounted
+MAX_SAMPLE_GAP = 600  # seconds
+
+MODES = {"1": "cooling", "2": "heating", "3": "fan"}
+
+# Auto speed is accounted at medium power and capacity
+FAN_POWER_OPTIONS = {
+    "low": CONF_FAN_POWER_LOW,
+    "medium": CONF_FAN_POWER_MEDIUM,
+    "high": CONF_FAN_POWER_HIGH,
+    "auto": CONF_FAN_POWER_MEDIUM,
+}
+COIL_CAPACITY_OPTIONS = {
+    "low": CONF_COIL_CAPACITY_LOW,
+    "medium": CONF_COIL_CAPACITY_MEDIUM,
+    "high": CONF_COIL_CAPACITY_HIGH,
+    "auto": CONF_COIL_CAPACITY_MEDIUM,
+}
+
+RUNTIME_KEYS = [f"runtime_{mode}" for mode in MODES.values()] + [
+    f"runtime_{speed}" for speed in FAN_SPEEDS.values()
+]
+ENERGY_KEYS = ["thermal_energy", "electrical_energy"]
+
+
+def _running_state(data):
+    """Return (mode, fan speed, coil active) while the unit runs, else None."""
+    mode = str(data.get("operation_mode", "0"))
+    if mode not in MODES:
+        return None
+    try:
+        room = float(data["rt"])
+        if mode == "1":
+            active = room > float(data["required_temp_cooling"])
+        elif mode == "2":
+            active = room < float(data["required_temp_heating"])
+        else:
+            active = str(data.get("device_status", "1")) == "0"
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not active:
+        return None
+    speed = FAN_SPEEDS.get(str(data.get(MODE_FAN_KEYS[mode], "3")), "auto")
+    return MODES[mode], speed, mode != "3"
+
+
+class EnergyMeter:
+    """Cumulative runtime (h) and energy (kWh) counters for one unit.
+
+    Each poll credits the time since the previous poll to the state the
+    unit was in at that previous poll, so an update costs O(1) however
+    long the history is.
+    """
+
+    def __init__(self, hass, entry_id):
+        """Initialize the meter."""
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.energy_{entry_id}")
+        self._totals = dict.fromkeys(RUNTIME_KEYS + ENERGY_KEYS, 0.0)
+        self._last = None
+
+    async def async_load(self):
+        """Load the persisted totals."""
+        stored = await self._store.async_load()
+        if stored:
+            self._totals.update(stored.get("totals", {}))
+
+    async def async_save(self):
+        """Persist the totals now."""
+        await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self):
+        """Remove the persisted totals."""
+        await self._store.async_remove()
+
+    def _data_to_save(self):
+        """Return the data to store."""
+        return {"totals": self._totals}
+
+    def get(self, key):
+        """Return a counter value."""
+        return self._totals.get(key)
+
+    def add_sample(self, data, options, now=None):
+        """Account the interval since the previous snapshot."""
+        if not data:
+            return
+        now = time.monotonic() if now is None else now
+        previous, self._last = self._last, (now, _running_state(data))
+        if previous is None or previous[1] is None:
+            return
+        elapsed = now - previous[0]
+        if elapsed <= 0 or elapsed > MAX_SAMPLE_GAP:
+            return
+
+        hours = elapsed / 3600
+        mode, speed, coil_active = previous[1]
+        self._totals[f"runtime_{mode}"] += hours
+        self._totals[f"runtime_{speed}"] += hours
+        self._totals["electrical_energy"] += (
+            options.get(FAN_POWER_OPTIONS[speed], DEFAULT_FAN_POWER) * hours / 1000
+        )
+        if coil_active:
+            self._totals["thermal_energy"] += (
+                options.get(COIL_CAPACITY_OPTIONS[speed], DEFAULT_COIL_CAPACITY) * hours
+            )
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
@@ -0,0 +1,79 @@
+"""Fleet-wide status decoding off the event loop."""
+import asyncio
+import logging
+
+from .parsing import parse_status
+
+_LOGGER = logging.getLogger(__name__)
+
+BATCH_WINDOW = 0.05  # seconds to collect payloads before decoding
+CHUNK_SIZE = 25  # units released to their entities per loop iteration
+
+
+def _decode_batch(texts):
+    """Decode payloads in a worker thread, keeping errors per payload."""
+    results = []
+    for text in texts:
+        try:
+            results.append((parse_status(text), None))
+        except ValueError as ex:
+            results.append((None, ex))
+    return results
+
+
+class FleetPipeline:
+    """Decode status payloads from all units in worker-thread batches.
+
+    When a poll sweep completes for many units at once, their payloads are
+    decoded together in one executor job. The results are then handed back
+    in chunks, yielding to the event loop in between, so the coordinators
+    and their entities are updated a few units at a time instead of in one
+    long stall.
+    """
+
+    def __init__(self, hass):
+        """Initialize the pipeline."""
+        self._hass = hass
+        self._pending = []
+        self._flush_handle = None
+
+    async def async_decode(self, text):
+        """Decode one status payload as part of the next batch."""
+        future = self._hass.loop.create_future()
+        self._pending.append((text, future))
+        if self._flush_handle is None:
+            self._flush_handle = self._hass.loop.call_later(BATCH_WINDOW, self._start_flush)
+        return await future
+
+    def _start_flush(self):
+        """Decode everything collected so far."""
+        self._flush_handle = None
+        batch, self._pending = self._pending, []
+        self._hass.async_create_task(self._async_flush(batch))
+
+    async def _async_flush(self, batch):
+        """Decode a batch and release the results chunk by chunk."""
+        try:
+            results = await self._hass.async_add_executor_job(
+                _decode_batch, [text for text, _ in batch]
+            )
+        except Exception as ex:  # pylint: disable=broad-except
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(ex)
+            return
+
+        if len(batch) > CHUNK_SIZE:
+            _LOGGER.debug("Decoded %d status payloads in one batch", len(batch))
+        for start in range(0, len(batch), CHUNK_SIZE):
+            if start:
+                await asyncio.sleep(0)
+            for (_, future), (data, error) in zip(
+                batch[start:start + CHUNK_SIZE], results[start:start + CHUNK_SIZE]
+            ):
+                if future.done():
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(data)
@@ -0,0 +1,83 @@
+"""Per-controller response latency tracking and deadline budgeting."""
+from collections import deque
+import math
+
+EWMA_ALPHA = 0.2
+WINDOW = 50  # recent responses kept for the percentile
+MIN_SAMPLES = 5
+PERCENTILE = 0.95
+
+# Headroom over the observed latency before a request is given up
+POLL_MARGIN = 2.0
+WRITE_MARGIN = 3.0
+
+
+class LatencyTracker:
+    """EWMA and 95th percentile of one controller's response times.
+
+    Deadlines follow what the controller actually needs, clamped between
+    a floor and a ceiling: units on wired bridges fail fast, units behind
+    weak repeaters get the time they need, and no request, so no sweep
+    across the fleet, ever waits longer than the ceiling.
+    """
+
+    def __init__(self, floor, ceiling):
+        """Initialize the tracker."""
+        self._floor = floor
+        self._ceiling = max(ceiling, floor)
+        self._samples = deque(maxlen=WINDOW)
+        self._ewma = None
+
+    @property
+    def ewma(self):
+        """Return the smoothed response time in seconds."""
+        return self._ewma
+
+    @property
+    def percentile(self):
+        """Return the 95th percentile response time in seconds."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, math.ceil(PERCENTILE * len(ordered)) - 1)]
+
+    def observe(self, seconds):
+        """Record a response time."""
+        self._samples.append(seconds)
+        if self._ewma is None:
+            self._ewma = seconds
+        else:
+            self._ewma += EWMA_ALPHA * (seconds - self._ewma)
+
+    def observe_timeout(self, deadline):
+        """Record a request that ran into its deadline.
+
+        The true latency is unknown but at least the deadline, so it is
+        counted as such and later deadlines grow towards the ceiling.
+        """
+        self.observe(deadline)
+
+    def _deadline(self, margin):
+        """Return a deadline with the given headroom."""
+        if len(self._samples) < MIN_SAMPLES:
+            return self._ceiling
+        expected = max(self.percentile, self._ewma) * margin
+        return min(max(expected, self._floor), self._ceiling)
+
+    def poll_deadline(self):
+        """Return the timeout for a status read."""
+        return self._deadline(POLL_MARGIN)
+
+    def write_deadline(self):
+        """Return the timeout for a control or configuration write."""
+        return self._deadline(WRITE_MARGIN)
+
+    def as_dict(self):
+        """Return the current figures."""
+        return {
+            "samples": len(self._samples),
+            "ewma": self._ewma,
+            "p95": self.percentile,
+            "poll_deadline": self.poll_deadline(),
+            "write_deadline": self.write_deadline(),
+        }
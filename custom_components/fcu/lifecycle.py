@@ -0,0 +1,57 @@
+"""Lifecycle of a loaded FCU config entry."""
+import asyncio
+import logging
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+DRAIN_TIMEOUT = 10  # seconds
+
+
+class EntryLifecycle:
+    """Track the device work started for an entry and wind it down on unload."""
+
+    def __init__(self, hass, name, api):
+        """Initialize the lifecycle."""
+        self._hass = hass
+        self._name = name
+        self._api = api
+        self._tasks = set()
+        self._closing = False
+
+    @property
+    def closing(self):
+        """Return True once the entry is being unloaded."""
+        return self._closing
+
+    def async_create_task(self, coro, name=None):
+        """Run a device task that unload has to wait for."""
+        if self._closing:
+            coro.close()
+            _LOGGER.debug("%s: not starting %s while unloading", self._name, name)
+            return None
+        task = self._hass.async_create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def async_shutdown(self, timeout=DRAIN_TIMEOUT):
+        """Drain in-flight work, cancel what misses the deadline and close."""
+        self._closing = True
+        deadline = time.monotonic() + timeout
+
+        if self._tasks:
+            _, pending = await asyncio.wait(set(self._tasks), timeout=timeout)
+            for task in pending:
+                task.cancel()
+            if pending:
+                _LOGGER.warning(
+                    "%s: cancelled %d task(s) still running at unload",
+                    self._name, len(pending),
+                )
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        if not await self._api.scheduler.async_drain(max(deadline - time.monotonic(), 0)):
+            _LOGGER.warning("%s: cancelling device requests still running at unload", self._name)
+        await self._api.scheduler.async_stop()
+        await self._api.async_close()
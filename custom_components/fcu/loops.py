@@ -0,0 +1,161 @@
+"""Hydronic loop groups sharing one water temperature."""
+import logging
+from statistics import median
+
+from homeassistant.core import callback
+from homeassistant.util import slugify
+
+_LOGGER = logging.getLogger(__name__)
+
+SWEEP_SETTLE = 2  # seconds to wait for the rest of a sweep before aggregating
+
+ERROR_WATER_LOW_HEATING = "2"
+ERROR_WATER_HIGH_COOLING = "4"
+
+
+class LoopGroup:
+    """Units on one hydronic loop and their aggregate water temperature.
+
+    Member updates that arrive together, as they do in a poll sweep, are
+    aggregated once after the sweep settles rather than once per unit.
+    """
+
+    def __init__(self, hass, name):
+        """Initialize the group."""
+        self._hass = hass
+        self.name = name
+        self.slug = slugify(name)
+        self.owner = None
+        self._members = {}
+        self._sensor_adders = {}
+        self._listeners = []
+        self._settle_handle = None
+        self.stats = None
+
+    @property
+    def empty(self):
+        """Return True when no unit is left in the group."""
+        return not self._members
+
+    @callback
+    def async_add_member(self, entry_id, coordinator):
+        """Add a unit; the first one to join owns the aggregate sensor."""
+        if self.owner is None:
+            self.owner = entry_id
+        self._members[entry_id] = (
+            coordinator,
+            coordinator.async_add_listener(self._handle_member_update),
+        )
+        self._refresh()
+
+    @callback
+    def async_remove_member(self, entry_id):
+        """Remove a unit."""
+        member = self._members.pop(entry_id, None)
+        if member is not None:
+            member[1]()
+        self._sensor_adders.pop(entry_id, None)
+        if self.owner == entry_id:
+            # The leaving unit's platform has already removed the sensor
+            self.owner = next(iter(self._members), None)
+            add_sensor = self._sensor_adders.get(self.owner)
+            if add_sensor is not None:
+                add_sensor()
+        if self.empty:
+            if self._settle_handle is not None:
+                self._settle_handle.cancel()
+                self._settle_handle = None
+        else:
+            self._refresh()
+
+    @callback
+    def async_register_sensor_platform(self, entry_id, add_sensor):
+        """Let a unit's sensor platform add the aggregate sensor.
+
+        add_sensor is called now when the unit owns the group, and later
+        when ownership moves to it. Returns a callback that unregisters.
+        """
+        self._sensor_adders[entry_id] = add_sensor
+        if self.owner == entry_id:
+            add_sensor()
+
+        @callback
+        def unregister():
+            if self._sensor_adders.get(entry_id) is add_sensor:
+                del self._sensor_adders[entry_id]
+
+        return unregister
+
+    @callback
+    def async_add_listener(self, listener):
+        """Call listener after every aggregation."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    @callback
+    def _refresh(self):
+        """Aggregate now unless a sweep is already settling."""
+        if self._settle_handle is None:
+            self._aggregate()
+
+    @callback
+    def _handle_member_update(self):
+        """Aggregate once the current sweep has settled."""
+        if self._settle_handle is None:
+            self._settle_handle = self._hass.loop.call_later(SWEEP_SETTLE, self._aggregate)
+
+    @callback
+    def _aggregate(self):
+        """Compute the loop statistics and notify listeners."""
+        self._settle_handle = None
+        temperatures = []
+        low_heating = high_cooling = 0
+        for coordinator, _ in self._members.values():
+            data = coordinator.data
+            if not data:
+                continue
+            try:
+                temperatures.append(float(data["wt"]))
+            except (KeyError, TypeError, ValueError):
+                pass
+            error = str(data.get("error_index", "0"))
+            if error == ERROR_WATER_LOW_HEATING:
+                low_heating += 1
+            elif error == ERROR_WATER_HIGH_COOLING:
+                high_cooling += 1
+
+        self.stats = None
+        if temperatures:
+            self.stats = {
+                "median": round(median(temperatures), 1),
+                "min": round(min(temperatures), 1),
+                "max": round(max(temperatures), 1),
+                "units": len(temperatures),
+                "water_temp_low_heating": low_heating,
+                "water_temp_high_cooling": high_cooling,
+            }
+        for listener in list(self._listeners):
+            listener()
+
+
+@callback
+def async_join_loop(hass, loops, name, entry_id, coordinator):
+    """Add a unit to a loop group, creating the group when needed.
+
+    Groups are keyed by the slug of their name, like the loop sensor's
+    IDs, so names differing only in case or spacing share one group.
+    Returns the group and a callback that takes the unit out again.
+    """
+    key = slugify(name)
+    group = loops.get(key)
+    if group is None:
+        group = loops[key] = LoopGroup(hass, name)
+    group.async_add_member(entry_id, coordinator)
+
+    @callback
+    def leave():
+        group.async_remove_member(entry_id)
+        if group.empty and loops.get(key) is group:
+            del loops[key]
+
+    return group, leave
@@ -0,0 +1,111 @@
+"""Publish FCU state on MQTT for consumers outside Home Assistant."""
+import json
+import logging
+
+from homeassistant.components import mqtt
+from homeassistant.core import callback
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_TOPIC = "state"
+RESULT_TOPIC = "result"
+COMMAND_TOPIC = "set"
+
+
+class MqttBridge:
+    """Mirror one unit's coordinator snapshots and writes onto MQTT.
+
+    Home Assistant stays the only poller: ``<base>/state`` carries the
+    last snapshot (retained, published only when it changes),
+    ``<base>/result`` the outcome of every control write, and JSON
+    commands on ``<base>/set`` go through the climate entity's write path.
+    """
+
+    def __init__(self, hass, entry_id, coordinator, api, lifecycle, base_topic):
+        """Initialize the bridge."""
+        self._hass = hass
+        self._entry_id = entry_id
+        self._coordinator = coordinator
+        self._api = api
+        self._lifecycle = lifecycle
+        self._base_topic = base_topic.rstrip("/")
+        self._last_state = None
+        self._unsubs = []
+        self._stopped = False
+
+    async def async_start(self):
+        """Subscribe to commands and start publishing."""
+        if not await mqtt.async_wait_for_mqtt_client(self._hass):
+            _LOGGER.error("MQTT bridge for %s disabled: MQTT is not available", self._base_topic)
+            return
+        unsub = await mqtt.async_subscribe(
+            self._hass, f"{self._base_topic}/{COMMAND_TOPIC}", self._handle_command
+        )
+        if self._stopped:
+            # The entry was unloaded while MQTT was starting
+            unsub()
+            return
+        self._unsubs.append(unsub)
+        self._unsubs.append(self._coordinator.async_add_listener(self._handle_update))
+        self._unsubs.append(self._api.async_add_write_listener(self._handle_write))
+        self._handle_update()
+
+    @callback
+    def async_stop(self):
+        """Stop publishing and drop the command subscription."""
+        self._stopped = True
+        while self._unsubs:
+            self._unsubs.pop()()
+
+    def _publish(self, topic, payload, retain=False):
+        """Publish without blocking the caller."""
+        self._hass.async_create_task(
+            mqtt.async_publish(
+                self._hass, f"{self._base_topic}/{topic}", payload, qos=0, retain=retain
+            )
+        )
+
+    @callback
+    def _handle_update(self):
+        """Publish the snapshot when it changed."""
+        if not self._coordinator.data:
+            return
+        payload = json.dumps(self._coordinator.data, sort_keys=True)
+        if payload == self._last_state:
+            return
+        self._last_state = payload
+        self._publish(STATE_TOPIC, payload, retain=True)
+
+    @callback
+    def _handle_write(self, params, state, error):
+        """Publish the outcome of a control write."""
+        result = {"request": params, "success": error is None}
+        if error is not None:
+            result["error"] = str(error)
+        else:
+            result["state"] = state
+        self._publish(RESULT_TOPIC, json.dumps(result, sort_keys=True))
+
+    @callback
+    def _handle_command(self, msg):
+        """Run a received command as a tracked device task."""
+        self._lifecycle.async_create_task(self._async_run_command(msg))
+
+    async def _async_run_command(self, msg):
+        """Route a JSON command through the climate entity."""
+        try:
+            command = json.loads(msg.payload)
+            if not isinstance(command, dict):
+                raise ValueError(f"Command must be an object: {msg.payload}")
+            climate = self._hass.data[DOMAIN][self._entry_id].get("climate")
+            if climate is None:
+                raise ValueError("Climate entity is not loaded")
+            await climate.async_apply_command(command)
+        except (ValueError, KeyError, TypeError) as ex:
+            _LOGGER.error("Rejected MQTT command on %s: %s", msg.topic, ex)
+            self._publish(
+                RESULT_TOPIC,
+                json.dumps({"request": msg.payload, "success": False, "error": str(ex)}),
+            )
@@ -0,0 +1,75 @@
+"""Support for FCU per-mode setpoints."""
+from homeassistant.components.number import NumberDeviceClass, NumberEntity
+from homeassistant.const import UnitOfTemperature
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from .const import DOMAIN
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+async def async_setup_entry(hass, entry, async_add_entities):
+    """Set up FCU setpoint numbers based on config_entry."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    device_info = {
+        "identifiers": {(DOMAIN, entry.entry_id)},  # Match climate entity identifier
+        "name": data["name"],
+        "manufacturer": "Eko Energis + Cotronika",
+        "model": "FCU Controller v.0.0.3RD",
+    }
+
+    async_add_entities([
+        FCUSetpointNumber(data["coordinator"], device_info, entry.entry_id, data["memory"],
+                          "Cooling Setpoint", "1"),
+        FCUSetpointNumber(data["coordinator"], device_info, entry.entry_id, data["memory"],
+                          "Heating Setpoint", "2"),
+    ])
+
+class FCUSetpointNumber(CoordinatorEntity, NumberEntity):
+    """Setpoint the unit uses in one mode."""
+
+    def __init__(self, coordinator, device_info, entry_id, memory, name, mode):
+        """Initialize the number."""
+        super().__init__(coordinator)
+        self._attr_device_info = device_info
+        self._attr_unique_id = f"{entry_id}_setpoint_{mode}"
+        self._attr_name = name
+        self._attr_has_entity_name = True
+        self._memory = memory
+        self._mode = mode
+        self._attr_device_class = NumberDeviceClass.TEMPERATURE
+        self._attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+        self._attr_native_min_value = 16
+        self._attr_native_max_value = 30
+        self._attr_native_step = 0.5
+        self._attr_should_poll = False  # Let coordinator handle updates
+        self._last_written = None
+
+    @property
+    def native_value(self):
+        """Return the setpoint."""
+        return self._memory.setpoint(self._mode)
+
+    @property
+    def extra_state_attributes(self):
+        """Return whether the value still waits to be written."""
+        return {"pending": self._memory.is_staged(self._mode)}
+
+    async def async_set_native_value(self, value: float) -> None:
+        """Stage a new setpoint."""
+        self._memory.async_stage(self._mode, temperature=float(value))
+        self._last_written = self._state_key()
+        self.async_write_ha_state()
+
+    def _state_key(self):
+        """Return what the published state depends on."""
+        return (self.available, self.native_value, self._memory.is_staged(self._mode))
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        state = self._state_key()
+        if state == self._last_written:
+            return
+        self._last_written = state
+        self.async_write_ha_state()
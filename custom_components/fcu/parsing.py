@@ -0,0 +1,30 @@
+"""Controller payload parsing.
+
+Kept free of Home Assistant imports so offline tools such as
+scripts/replay_capture.py can load it on its own.
+"""
+import ast
+import json
+
+
+def parse_payload(text):
+    """Parse a reply body, accepting both JSON and Python-literal payloads."""
+    try:
+        data = json.loads(text.replace("'", '"'))
+    except json.JSONDecodeError:
+        try:
+            data = ast.literal_eval(text)
+        except (ValueError, SyntaxError) as ex:
+            raise ValueError(f"Unparseable status: {text!r}") from ex
+    if not isinstance(data, dict):
+        raise ValueError(f"Invalid status format: {text!r}")
+    return data
+
+
+def parse_status(text):
+    """Parse a full status body."""
+    data = parse_payload(text)
+    # Ensure these values are properly parsed
+    data["device_status"] = str(data.get("device_status", "0"))
+    data["error_index"] = str(data.get("error_index", "0"))
+    return data
@@ -0,0 +1,64 @@
+"""Setup latency profiling for FCU config entries."""
+from contextlib import contextmanager
+import logging
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SetupProfiler:
+    """Record how long each phase of an entry's setup takes.
+
+    Phases are stored as durations and marks as offsets from the start of
+    setup, all in milliseconds, and reported through diagnostics. With
+    logging enabled a summary is also logged once the entry is up.
+    """
+
+    def __init__(self, name, import_seconds=None, log_summary=False):
+        """Initialize the profiler."""
+        self._name = name
+        self._started = time.perf_counter()
+        self._import_seconds = import_seconds
+        self._log_summary = log_summary
+        self._phases = {}
+        self._marks = {}
+
+    @contextmanager
+    def phase(self, name):
+        """Time a block of setup."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._phases[name] = (time.perf_counter() - started) * 1000
+
+    async def async_timed(self, name, awaitable):
+        """Time an awaitable, so concurrent phases are timed separately."""
+        started = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self._phases[name] = (time.perf_counter() - started) * 1000
+
+    def mark(self, name):
+        """Record when something first happened, relative to setup start."""
+        if name not in self._marks:
+            self._marks[name] = (time.perf_counter() - self._started) * 1000
+
+    def finish(self):
+        """Mark the end of setup and log the profile when enabled."""
+        self.mark("setup_done")
+        if self._log_summary:
+            _LOGGER.info("%s setup profile: %s", self._name, self.as_dict())
+
+    def as_dict(self):
+        """Return the recorded timings."""
+        return {
+            "module_import_ms": (
+                round(self._import_seconds * 1000, 1)
+                if self._import_seconds is not None
+                else None
+            ),
+            "phases_ms": {name: round(value, 1) for name, value in self._phases.items()},
+            "marks_ms": {name: round(value, 1) for name, value in self._marks.items()},
+        }
@@ -0,0 +1,123 @@
+"""Record and replay controller traffic."""
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+
+import aiohttp
+
+from .capture import read_capture
+
+_LOGGER = logging.getLogger(__name__)
+
+FLUSH_DELAY = 5  # seconds between appends to the capture file
+
+# The record format is described in capture.py
+
+
+def _append_lines(path, lines):
+    """Append capture lines to the file."""
+    with open(path, "a", encoding="utf-8") as capture:
+        capture.writelines(lines)
+
+
+class RecordingTransport:
+    """Wrap a transport and append every exchange to a capture file."""
+
+    def __init__(self, hass, transport, path):
+        """Initialize the recorder."""
+        self._hass = hass
+        self._transport = transport
+        self._path = path
+        self._start = time.monotonic()
+        self._buffer = []
+        self._flush_handle = None
+
+    async def async_post(self, endpoint, data=None, timeout=None):
+        """POST through the wrapped transport and record the exchange."""
+        started = time.monotonic()
+        record = {
+            "t": round(started - self._start, 3),
+            "ep": endpoint,
+            "req": dict(data) if data is not None else None,
+        }
+        try:
+            status, text = await self._transport.async_post(endpoint, data, timeout)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as ex:
+            record["ms"] = round((time.monotonic() - started) * 1000)
+            record["err"] = type(ex).__name__
+            if isinstance(ex, asyncio.TimeoutError):
+                # aiohttp raises its own timeout types; replay them all as timeouts
+                record["to"] = True
+            self._record(record)
+            raise
+        record["ms"] = round((time.monotonic() - started) * 1000)
+        record["st"] = status
+        record["b"] = text
+        self._record(record)
+        return status, text
+
+    def _record(self, record):
+        """Buffer a record for the next append."""
+        self._buffer.append(json.dumps(record, separators=(",", ":")) + "\n")
+        if self._flush_handle is None:
+            self._flush_handle = self._hass.loop.call_later(FLUSH_DELAY, self._flush)
+
+    def _flush(self):
+        """Append buffered records in the executor."""
+        self._flush_handle = None
+        lines, self._buffer = self._buffer, []
+        if lines:
+            self._hass.async_add_executor_job(_append_lines, self._path, lines)
+
+    async def async_close(self):
+        """Write out what is buffered and close the wrapped transport."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        lines, self._buffer = self._buffer, []
+        if lines:
+            await self._hass.async_add_executor_job(_append_lines, self._path, lines)
+        await self._transport.async_close()
+
+
+class ReplayTransport:
+    """Answer requests from a capture instead of a controller.
+
+    Each endpoint's responses are served in capture order, after the
+    recorded response time divided by ``speed``. A speed of 0 answers
+    immediately.
+    """
+
+    def __init__(self, records, speed=1.0):
+        """Initialize the replay."""
+        self._speed = speed
+        self._queues = {}
+        for record in records:
+            self._queues.setdefault(record["ep"], deque()).append(record)
+
+    @classmethod
+    async def async_from_file(cls, hass, path, speed=1.0):
+        """Load a capture file."""
+        records = await hass.async_add_executor_job(read_capture, path)
+        _LOGGER.debug("Loaded %d recorded exchanges from %s", len(records), path)
+        return cls(records, speed)
+
+    async def async_post(self, endpoint, data=None, timeout=None):
+        """Return the next recorded response for the endpoint."""
+        queue = self._queues.get(endpoint)
+        if not queue:
+            raise aiohttp.ClientError(f"Replay has no more responses for {endpoint}")
+        record = queue.popleft()
+        if self._speed:
+            await asyncio.sleep(record.get("ms", 0) / 1000 / self._speed)
+        if "err" in record:
+            # Captures from before the timeout flag only have the type name
+            if record.get("to") or record["err"] == "TimeoutError":
+                raise asyncio.TimeoutError
+            raise aiohttp.ClientError(f"Replayed {record['err']}")
+        return record["st"], record["b"]
+
+    async def async_close(self):
+        """Nothing to close."""
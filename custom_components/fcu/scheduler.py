@@ -0,0 +1,179 @@
+"""Per-controller request scheduler."""
+import asyncio
+import heapq
+import itertools
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+# Priority classes, most urgent first
+PRIORITY_CONTROL = 0
+PRIORITY_CONFIRM = 1
+PRIORITY_POLL = 2
+PRIORITY_DIAGNOSTIC = 3
+
+
+class SchedulerClosedError(Exception):
+    """Raised for background requests submitted while shutting down."""
+
+
+class _Job:
+    """A queued request."""
+
+    __slots__ = ("priority", "request", "future", "skippable", "absorbed")
+
+    def __init__(self, priority, request, future, skippable):
+        """Initialize the job."""
+        self.priority = priority
+        self.request = request
+        self.future = future
+        self.skippable = skippable
+        self.absorbed = []
+
+
+class RequestScheduler:
+    """Send requests to one controller one at a time, most urgent first.
+
+    The controllers only serve one request at a time, so everything goes
+    through a single worker. When a control write is queued, waiting
+    skippable polls are taken out of the queue and answered with the
+    write's result, which already reflects the device's new state. A
+    request that is already in flight always completes: aborting it would
+    leave the controller busy with it anyway.
+    """
+
+    def __init__(self, name):
+        """Initialize the scheduler."""
+        self._name = name
+        self._queue = []
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._worker = None
+        self._closing = False
+
+    def async_start(self, hass):
+        """Start the worker."""
+        self._worker = hass.async_create_background_task(
+            self._async_run(), f"fcu request scheduler {self._name}"
+        )
+
+    async def async_drain(self, timeout):
+        """Finish pending writes and confirmations within a deadline.
+
+        Queued polls and diagnostics are dropped and new ones are refused.
+        Returns False when work was still running at the deadline.
+        """
+        self._closing = True
+        kept = []
+        for entry in self._queue:
+            if entry[0] >= PRIORITY_POLL:
+                entry[2].future.cancel()
+            else:
+                kept.append(entry)
+        heapq.heapify(kept)
+        self._queue = kept
+        if not self._queue and self._worker is None:
+            return True
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def async_stop(self):
+        """Stop the worker and cancel everything still queued."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        while self._queue:
+            _, _, job = heapq.heappop(self._queue)
+            job.future.cancel()
+            for absorbed in job.absorbed:
+                absorbed.future.cancel()
+
+    async def async_submit(self, priority, request, skippable=False):
+        """Queue a request factory and wait for its result."""
+        if self._closing and priority >= PRIORITY_POLL:
+            raise SchedulerClosedError(f"{self._name} is shutting down")
+        if skippable:
+            # Share an identical request that is already waiting
+            for _, _, queued in self._queue:
+                if (
+                    queued.skippable
+                    and queued.priority == priority
+                    and queued.request == request
+                    and not queued.future.done()
+                ):
+                    return await asyncio.shield(queued.future)
+
+        job = _Job(priority, request, asyncio.get_running_loop().create_future(), skippable)
+        if priority == PRIORITY_CONTROL:
+            self._absorb_skippable(job)
+        heapq.heappush(self._queue, (priority, next(self._counter), job))
+        self._idle.clear()
+        self._wakeup.set()
+        return await job.future
+
+    def _absorb_skippable(self, job):
+        """Move waiting skippable requests behind a control write."""
+        kept = []
+        for entry in self._queue:
+            queued = entry[2]
+            if queued.skippable and not queued.future.done():
+                job.absorbed.append(queued)
+            else:
+                kept.append(entry)
+        if job.absorbed:
+            _LOGGER.debug(
+                "%s: skipping %d queued poll(s) for a control write",
+                self._name, len(job.absorbed),
+            )
+            heapq.heapify(kept)
+            self._queue = kept
+
+    def _requeue(self, jobs):
+        """Put jobs back in the queue."""
+        for job in jobs:
+            if self._closing:
+                job.future.cancel()
+                continue
+            heapq.heappush(self._queue, (job.priority, next(self._counter), job))
+
+    async def _async_run(self):
+        """Serve queued requests one at a time."""
+        while True:
+            while not self._queue:
+                self._idle.set()
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            _, _, job = heapq.heappop(self._queue)
+            if job.future.done():
+                # The caller gave up while the job was waiting
+                self._requeue(job.absorbed)
+                continue
+
+            try:
+                result = await job.request()
+            except asyncio.CancelledError:
+                job.future.cancel()
+                for absorbed in job.absorbed:
+                    absorbed.future.cancel()
+                raise
+            except Exception as ex:  # pylint: disable=broad-except
+                if not job.future.done():
+                    job.future.set_exception(ex)
+                # The write failed, so the skipped polls still have to run
+                self._requeue(job.absorbed)
+                continue
+
+            if not job.future.done():
+                job.future.set_result(result)
+            for absorbed in job.absorbed:
+                if not absorbed.future.done():
+                    absorbed.future.set_result(result)
@@ -0,0 +1,73 @@
+"""Support for FCU per-mode fan speeds."""
+from homeassistant.components.select import SelectEntity
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from .const import DOMAIN
+from .api import FAN_SPEEDS
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+async def async_setup_entry(hass, entry, async_add_entities):
+    """Set up FCU fan speed selects based on config_entry."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    device_info = {
+        "identifiers": {(DOMAIN, entry.entry_id)},  # Match climate entity identifier
+        "name": data["name"],
+        "manufacturer": "Eko Energis + Cotronika",
+        "model": "FCU Controller v.0.0.3RD",
+    }
+
+    async_add_entities([
+        FCUFanSpeedSelect(data["coordinator"], device_info, entry.entry_id, data["memory"],
+                          "Cooling Fan Speed", "1"),
+        FCUFanSpeedSelect(data["coordinator"], device_info, entry.entry_id, data["memory"],
+                          "Heating Fan Speed", "2"),
+        FCUFanSpeedSelect(data["coordinator"], device_info, entry.entry_id, data["memory"],
+                          "Fan Only Fan Speed", "3"),
+    ])
+
+class FCUFanSpeedSelect(CoordinatorEntity, SelectEntity):
+    """Fan speed the unit uses in one mode."""
+
+    def __init__(self, coordinator, device_info, entry_id, memory, name, mode):
+        """Initialize the select."""
+        super().__init__(coordinator)
+        self._attr_device_info = device_info
+        self._attr_unique_id = f"{entry_id}_fan_speed_{mode}"
+        self._attr_name = name
+        self._attr_has_entity_name = True
+        self._memory = memory
+        self._mode = mode
+        self._attr_options = list(FAN_SPEEDS.values())
+        self._attr_should_poll = False  # Let coordinator handle updates
+        self._last_written = None
+
+    @property
+    def current_option(self):
+        """Return the fan speed."""
+        return self._memory.fan_mode(self._mode)
+
+    @property
+    def extra_state_attributes(self):
+        """Return whether the value still waits to be written."""
+        return {"pending": self._memory.is_staged(self._mode)}
+
+    async def async_select_option(self, option: str) -> None:
+        """Stage a new fan speed."""
+        self._memory.async_stage(self._mode, fan_mode=option)
+        self._last_written = self._state_key()
+        self.async_write_ha_state()
+
+    def _state_key(self):
+        """Return what the published state depends on."""
+        return (self.available, self.current_option, self._memory.is_staged(self._mode))
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        state = self._state_key()
+        if state == self._last_written:
+            return
+        self._last_written = state
+        self.async_write_ha_state()
@@ -2,14 +2,27 @@
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
+    SensorStateClass,
 )
-from homeassistant.const import UnitOfTemperature, CONF_NAME
+from homeassistant.const import UnitOfEnergy, UnitOfTemperature, UnitOfTime, CONF_NAME
+from homeassistant.core import callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from .const import DOMAIN
 import logging
 
 _LOGGER = logging.getLogger(__name__)
 
+RUNTIME_SENSORS = {
+    "runtime_cooling": "Cooling Runtime",
+    "runtime_heating": "Heating Runtime",
+    "runtime_fan": "Fan Only Runtime",
+    "runtime_low": "Low Speed Runtime",
+    "runtime_medium": "Medium Speed Runtime",
+    "runtime_high": "High Speed Runtime",
+    "runtime_auto": "Auto Speed Runtime",
+}
+
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up FCU sensors based on config_entry."""
     data = hass.data[DOMAIN][entry.entry_id]
@@ -32,16 +45,6 @@ async def async_setup_entry(hass, entry, async_add_entities):
             SensorDeviceClass.TEMPERATURE,
             round_to=1
         ),
-        FCUSensor(
-            coordinator,
-            device_info,
-            entry.entry_id,
-            "Water Temperature",
-            "wt",
-            UnitOfTemperature.CELSIUS,
-            SensorDeviceClass.TEMPERATURE,
-            round_to=1
-        ),
         FCUSensor(
             coordinator,
             device_info,
@@ -58,10 +61,93 @@ async def async_setup_entry(hass, entry, async_add_entities):
             }
         ),
     ]
-    
+
+    if data["loop_aggregate_only"]:
+        # The loop sensor records the water temperature instead
+        registry = er.async_get(hass)
+        entity_id = registry.async_get_entity_id("sensor", DOMAIN, f"{entry.entry_id}_wt")
+        if entity_id is not None:
+            registry.async_remove(entity_id)
+    else:
+        entities.insert(1, FCUSensor(
+            coordinator,
+            device_info,
+            entry.entry_id,
+            "Water Temperature",
+            "wt",
+            UnitOfTemperature.CELSIUS,
+            SensorDeviceClass.TEMPERATURE,
+            round_to=1
+        ))
+
+    energy = data["energy"]
+    entities.extend(
+        FCUTotalSensor(
+            coordinator,
+            device_info,
+            entry.entry_id,
+            energy,
+            name,
+            key,
+            UnitOfTime.HOURS,
+            SensorDeviceClass.DURATION,
+        )
+        for key, name in RUNTIME_SENSORS.items()
+    )
+    entities.extend([
+        FCUTotalSensor(
+            coordinator,
+            device_info,
+            entry.entry_id,
+            energy,
+            "Thermal Energy",
+            "thermal_energy",
+            UnitOfEnergy.KILO_WATT_HOUR,
+            SensorDeviceClass.ENERGY,
+        ),
+        FCUTotalSensor(
+            coordinator,
+            device_info,
+            entry.entry_id,
+            energy,
+            "Electrical Energy",
+            "electrical_energy",
+            UnitOfEnergy.KILO_WATT_HOUR,
+            SensorDeviceClass.ENERGY,
+        ),
+    ])
+
     async_add_entities(entities)
 
-class FCUSensor(CoordinatorEntity, SensorEntity):
+    # One unit per loop group carries the loop's aggregate sensor. When
+    # that unit unloads, the group hands the sensor to another member.
+    loop = data["loop"]
+    if loop is not None:
+        entry.async_on_unload(
+            loop.async_register_sensor_platform(
+                entry.entry_id, lambda: async_add_entities([FCULoopSensor(loop)])
+            )
+        )
+
+class FCUCoordinatorSensor(CoordinatorEntity, SensorEntity):
+    """Sensor that only writes its state when the value changed.
+
+    Most polls leave most values unchanged, so skipping those writes keeps
+    large fleets from flooding the state machine on every sweep.
+    """
+
+    _last_written = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        state = (self.available, self.native_value)
+        if state == self._last_written:
+            return
+        self._last_written = state
+        self.async_write_ha_state()
+
+class FCUSensor(FCUCoordinatorSensor):
     """FCU Sensor."""
     
     def __init__(self, coordinator, device_info, entry_id, name, key, unit, device_class, states=None, round_to=None):
@@ -94,3 +180,78 @@ class FCUSensor(CoordinatorEntity, SensorEntity):
             except (ValueError, TypeError):
                 return value
         return value
+
+
+class FCUTotalSensor(FCUCoordinatorSensor):
+    """FCU cumulative runtime or energy sensor."""
+
+    def __init__(self, coordinator, device_info, entry_id, meter, name, key, unit, device_class):
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._attr_device_info = device_info
+        self._attr_unique_id = f"{entry_id}_{key}"
+        self._attr_name = name
+        self._attr_has_entity_name = True
+        self._meter = meter
+        self._key = key
+        self._attr_native_unit_of_measurement = unit
+        self._attr_device_class = device_class
+        self._attr_state_class = SensorStateClass.TOTAL_INCREASING
+        self._attr_should_poll = False  # Let coordinator handle updates
+
+    @property
+    def native_value(self):
+        """Return the accumulated total."""
+        return round(self._meter.get(self._key), 3)
+
+
+class FCULoopSensor(SensorEntity):
+    """Water temperature of a hydronic loop, aggregated over its units."""
+
+    def __init__(self, loop):
+        """Initialize the sensor."""
+        self._loop = loop
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, f"loop_{loop.slug}")},
+            "name": f"Loop {loop.name}",
+            "manufacturer": "Eko Energis + Cotronika",
+            "model": "Hydronic loop",
+        }
+        self._attr_unique_id = f"loop_{loop.slug}_wt"
+        self._attr_name = "Water Temperature"
+        self._attr_has_entity_name = True
+        self._attr_native_unit_of_measurement = UnitOfTemperature.CELSIUS
+        self._attr_device_class = SensorDeviceClass.TEMPERATURE
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_should_poll = False
+        self._last_written = None
+
+    async def async_added_to_hass(self):
+        """Subscribe to loop aggregation."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._loop.async_add_listener(self._handle_loop_update))
+
+    @property
+    def available(self) -> bool:
+        """Return if the loop has any reading."""
+        return self._loop.stats is not None
+
+    @property
+    def native_value(self):
+        """Return the median water temperature."""
+        return self._loop.stats["median"] if self._loop.stats else None
+
+    @property
+    def extra_state_attributes(self):
+        """Return the spread and water temperature errors across the loop."""
+        if not self._loop.stats:
+            return None
+        return {key: value for key, value in self._loop.stats.items() if key != "median"}
+
+    @callback
+    def _handle_loop_update(self) -> None:
+        """Handle a new loop aggregate."""
+        if self._loop.stats == self._last_written:
+            return
+        self._last_written = self._loop.stats
+        self.async_write_ha_state()
@@ -0,0 +1,253 @@
+"""Learned thermal response and pre-conditioning for FCU units."""
+import logging
+import math
+from datetime import timedelta
+
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    CONF_PRECONDITION, CONF_OCCUPANCY_START, CONF_PRECONDITION_MAX_LEAD,
+    DEFAULT_PRECONDITION, DEFAULT_OCCUPANCY_START, DEFAULT_PRECONDITION_MAX_LEAD,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 120  # seconds
+
+# Online least squares with exponential forgetting, so old behaviour fades
+# out as the building or the loop changes.
+FORGETTING_FACTOR = 0.995
+MIN_SAMPLES = 10
+MAX_SAMPLE_GAP = timedelta(minutes=10)
+# Refreshes right after a write land seconds after the poll before them;
+# a 0.1 degree step over such a short interval would look like a huge rate
+MIN_SAMPLE_INTERVAL = timedelta(seconds=20)
+
+# Device operation modes that move the room temperature
+MODE_COOL = "1"
+MODE_HEAT = "2"
+
+
+def _fan_key(data, mode):
+    """Return the fan speed the device reports for the given mode."""
+    if mode == MODE_COOL:
+        return str(data.get("fan_state_current_cooling", "3"))
+    return str(data.get("fan_state_current_heating", "3"))
+
+
+def _conditioning(data, mode, room):
+    """Return True while the unit is heating or cooling the room."""
+    try:
+        if mode == MODE_COOL:
+            return room > float(data["required_temp_cooling"])
+        if mode == MODE_HEAT:
+            return room < float(data["required_temp_heating"])
+    except (KeyError, TypeError, ValueError):
+        pass
+    return False
+
+
+class ThermalModel:
+    """Per-unit model of room temperature rate versus water/room delta.
+
+    For every (mode, fan speed) pair the rate of change of ``rt`` in
+    degrees per minute is fitted as ``rate = a + b * (wt - rt)``. Only
+    intervals where the unit was conditioning the room throughout are
+    learned from, and only the running sums are kept, so each sample is an
+    O(1) update.
+    """
+
+    def __init__(self, hass, entry_id):
+        """Initialize the model."""
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.thermal_{entry_id}")
+        self._fits = {}
+        self._last_sample = None
+        self._last_precondition = None
+
+    async def async_load(self):
+        """Load the persisted model."""
+        stored = await self._store.async_load()
+        if stored:
+            self._fits = stored.get("fits", {})
+            _LOGGER.debug("Loaded thermal model with %d fits", len(self._fits))
+
+    async def async_save(self):
+        """Persist the model now."""
+        await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self):
+        """Remove the persisted model."""
+        await self._store.async_remove()
+
+    def _data_to_save(self):
+        """Return the data to store."""
+        return {"fits": self._fits}
+
+    def add_sample(self, data, now=None):
+        """Feed one coordinator snapshot into the model."""
+        if not data:
+            return
+        now = now or dt_util.now()
+        try:
+            sample = (
+                now,
+                float(data["rt"]),
+                float(data["wt"]),
+                str(data.get("operation_mode", "0")),
+            )
+        except (KeyError, TypeError, ValueError):
+            return
+        mode = sample[3]
+        fan = _fan_key(data, mode)
+        active = _conditioning(data, mode, sample[1])
+        previous = self._last_sample
+        if (
+            previous is not None
+            and previous[0][3] == mode
+            and previous[1] == fan
+            and now - previous[0][0] < MIN_SAMPLE_INTERVAL
+        ):
+            # Too soon to measure a rate, keep timing from the earlier sample
+            return
+        self._last_sample = (sample, fan, active)
+        if previous is None:
+            return
+
+        (prev_time, prev_rt, prev_wt, prev_mode), prev_fan, prev_active = previous
+        if mode not in (MODE_COOL, MODE_HEAT) or mode != prev_mode or fan != prev_fan:
+            return
+        # Idle intervals at setpoint would drag the learned rate towards zero
+        if not (prev_active and active):
+            return
+        elapsed = now - prev_time
+        if elapsed <= timedelta(0) or elapsed > MAX_SAMPLE_GAP:
+            return
+
+        rate = (sample[1] - prev_rt) / (elapsed.total_seconds() / 60)
+        delta = prev_wt - prev_rt
+        fit = self._fits.setdefault(
+            f"{mode}:{fan}", {"n": 0.0, "x": 0.0, "y": 0.0, "xx": 0.0, "xy": 0.0}
+        )
+        for key in fit:
+            fit[key] *= FORGETTING_FACTOR
+        fit["n"] += 1.0
+        fit["x"] += delta
+        fit["y"] += rate
+        fit["xx"] += delta * delta
+        fit["xy"] += delta * rate
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _coefficients(self, mode, fan):
+        """Return the fitted (a, b) of ``rate = a + b * delta``, or None."""
+        fit = self._fits.get(f"{mode}:{fan}")
+        if not fit or fit["n"] < MIN_SAMPLES:
+            return None
+        n = fit["n"]
+        variance = fit["xx"] - fit["x"] * fit["x"] / n
+        if variance <= 1e-6:
+            return fit["y"] / n, 0.0
+        slope = (fit["xy"] - fit["x"] * fit["y"] / n) / variance
+        return (fit["y"] - slope * fit["x"]) / n, slope
+
+    def predict_rate(self, mode, fan, delta):
+        """Return the expected rate in degrees per minute, or None."""
+        coefficients = self._coefficients(mode, fan)
+        if coefficients is None:
+            return None
+        intercept, slope = coefficients
+        return intercept + slope * delta
+
+    def minutes_to_setpoint(self, data, mode, target):
+        """Return the minutes the unit needs to bring rt to target, or None.
+
+        The rate slows as the room approaches the water temperature, so
+        the fit is integrated rather than projected in a straight line:
+        with d = wt - rt, dd/dt = -(a + b * d), which gives
+        t = ln((a + b * d_end) / (a + b * d_now)) / -b.
+        """
+        try:
+            room = float(data["rt"])
+            water = float(data["wt"])
+            target = float(target)
+        except (KeyError, TypeError, ValueError):
+            return None
+        needed = target - room
+        if (mode == MODE_HEAT and needed <= 0) or (mode == MODE_COOL and needed >= 0):
+            return 0.0
+        coefficients = self._coefficients(mode, _fan_key(data, mode))
+        if coefficients is None:
+            return None
+        intercept, slope = coefficients
+        rate_now = intercept + slope * (water - room)
+        if not rate_now or (rate_now > 0) != (needed > 0):
+            return None
+        if abs(slope) < 1e-9:
+            return needed / rate_now
+        rate_end = intercept + slope * (water - target)
+        # The rate reaches zero before the room gets to the target
+        if rate_end / rate_now <= 0:
+            return None
+        return math.log(rate_end / rate_now) / -slope
+
+    def mark_preconditioned(self, now=None):
+        """Record that today's pre-conditioning write went through."""
+        self._last_precondition = (now or dt_util.now()).date()
+
+    def precondition_mode(self, data, options, now=None):
+        """Return the device mode to start now to be on setpoint at occupancy.
+
+        Returns None when the unit should stay as it is. The caller marks
+        the day done with mark_preconditioned once the write succeeded.
+        """
+        if not data or not options.get(CONF_PRECONDITION, DEFAULT_PRECONDITION):
+            return None
+        if str(data.get("operation_mode", "0")) != "0":
+            return None
+        now = now or dt_util.now()
+        try:
+            hour, minute = (
+                int(part)
+                for part in options.get(CONF_OCCUPANCY_START, DEFAULT_OCCUPANCY_START).split(":")
+            )
+            occupancy = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        except ValueError:
+            _LOGGER.error("Invalid occupancy start: %s", options.get(CONF_OCCUPANCY_START))
+            return None
+        if now >= occupancy or self._last_precondition == occupancy.date():
+            return None
+
+        max_lead = options.get(CONF_PRECONDITION_MAX_LEAD, DEFAULT_PRECONDITION_MAX_LEAD)
+        remaining = (occupancy - now).total_seconds() / 60
+        if remaining > max_lead:
+            return None
+
+        try:
+            room = float(data["rt"])
+        except (KeyError, TypeError, ValueError):
+            return None
+        for mode, target_key in (
+            (MODE_HEAT, "required_temp_heating"),
+            (MODE_COOL, "required_temp_cooling"),
+        ):
+            try:
+                target = float(data[target_key])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if (mode == MODE_HEAT and room >= target) or (
+                mode == MODE_COOL and room <= target
+            ):
+                continue
+            minutes = self.minutes_to_setpoint(data, mode, target)
+            # Without a learned rate, start at the maximum lead time
+            if minutes is None:
+                minutes = max_lead
+            if minutes >= remaining:
+                _LOGGER.debug(
+                    "Pre-conditioning mode %s: %.1f min needed, %.1f min to occupancy",
+                    mode, minutes, remaining,
+                )
+                return mode
+        return None
@@ -0,0 +1,86 @@
+"""Run a recorded capture through the status parser.
+
+Usage: python scripts/replay_capture.py CAPTURE [--speed SPEED]
+
+Every recorded status reply is parsed with parse_status and the parse
+time is reported. The exit code is 1 when a reply no longer parses, so a
+capture taken from a real controller doubles as an offline benchmark and
+regression check. It needs only the standard library, not a Home
+Assistant install.
+"""
+import argparse
+import asyncio
+import importlib.util
+import sys
+import time
+from pathlib import Path
+
+PACKAGE = Path(__file__).resolve().parents[1] / "custom_components" / "fcu"
+STATUS_ENDPOINT = "/wifi/shortstatus"
+
+
+def _load(name):
+    """Load a module of the integration by path.
+
+    Importing the package would run its __init__ and pull in Home
+    Assistant; these modules only need the standard library.
+    """
+    spec = importlib.util.spec_from_file_location(f"fcu_{name}", PACKAGE / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+capture = _load("capture")
+parse_status = _load("parsing").parse_status
+
+
+async def async_main(args):
+    """Parse the capture and print a summary."""
+    records = capture.read_capture(args.capture)
+    parsed = failed = request_errors = 0
+    parse_seconds = 0.0
+    async for record in capture.async_iter_capture(records, args.speed):
+        if record["ep"] != STATUS_ENDPOINT:
+            continue
+        if "err" in record:
+            request_errors += 1
+            continue
+        started = time.perf_counter()
+        try:
+            parse_status(record["b"])
+        except ValueError as ex:
+            failed += 1
+            print(f"t={record['t']}s: {ex}", file=sys.stderr)
+        else:
+            parsed += 1
+        parse_seconds += time.perf_counter() - started
+
+    total = parsed + failed
+    print(
+        f"{len(records)} exchanges, {total} status replies: {parsed} parsed, "
+        f"{failed} failed, {request_errors} failed requests"
+    )
+    if total:
+        print(
+            f"parse time {parse_seconds * 1000:.2f} ms total, "
+            f"{parse_seconds * 1e6 / total:.1f} us per reply"
+        )
+    return 1 if failed else 0
+
+
+def main():
+    """Parse the arguments and run."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("capture", help="capture file written by 'Record controller traffic'")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=0,
+        help="replay at the recorded pace divided by SPEED; 0 (default) runs flat out",
+    )
+    return asyncio.run(async_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
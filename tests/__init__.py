@@ -0,0 +1 @@
+"""Tests for the Fan Coil Unit integration."""
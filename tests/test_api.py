@@ -0,0 +1,58 @@
+"""Tests for the controller reply parsers."""
+import pytest
+
+from custom_components.fcu.api import parse_control_ack, parse_status
+
+PARAMS = {"required_temp": "23.5", "required_mode": "1", "required_speed": "2"}
+
+
+def test_parse_status_accepts_python_literals():
+    """Parse single-quoted payloads and fill in the status defaults."""
+    data = parse_status("{'rt': '21.5', 'operation_mode': 2}")
+    assert data["rt"] == "21.5"
+    assert data["device_status"] == "0"
+    assert data["error_index"] == "0"
+
+
+@pytest.mark.parametrize("text", ["", "OK", "[1, 2]", "{'rt': "])
+def test_parse_status_rejects_garbage(text):
+    """Raise ValueError for bodies that are not a status object."""
+    with pytest.raises(ValueError):
+        parse_status(text)
+
+
+def test_ack_from_a_full_status_reply():
+    """Use a reply that carries the status as is."""
+    ack = parse_control_ack(
+        '{"operation_mode": "1", "required_temp_cooling": "23.5", "error_index": "2"}',
+        PARAMS,
+    )
+    assert ack["operation_mode"] == "1"
+    assert ack["error_index"] == "2"
+
+
+def test_partial_ack_keeps_status_and_error():
+    """Do not invent device_status or error_index for a partial reply."""
+    ack = parse_control_ack('{"operation_mode": "1"}', PARAMS)
+    assert ack == {"operation_mode": "1"}
+
+
+def test_ack_from_echoed_form_fields():
+    """Map echoed required_* fields onto the snapshot keys they control."""
+    ack = parse_control_ack(
+        '{"required_mode": "1", "required_temp": "23.5", "required_speed": 2}', PARAMS
+    )
+    assert ack == {
+        "operation_mode": "1",
+        "required_temp_cooling": "23.5",
+        "fan_state_current_cooling": "2",
+    }
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["OK", '{"result": "ok"}', '{"required_mode": "2", "required_temp": "21"}'],
+)
+def test_replies_that_do_not_confirm(text):
+    """Return None so the write is confirmed by a status read."""
+    assert parse_control_ack(text, PARAMS) is None
@@ -0,0 +1,110 @@
+"""Tests for the FCU options flow."""
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from homeassistant.data_entry_flow import FlowResultType
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.fcu.const import (
+    CONF_LOOP_GROUP,
+    CONF_REPLAY_FILE,
+    CONF_SHUTDOWN_DELAY,
+    CONF_T1D,
+    CONF_T2D,
+    CONF_T3D,
+    CONF_T4D,
+    CONF_TIMEOUT_CEILING,
+    CONF_TIMEOUT_FLOOR,
+    DOMAIN,
+)
+
+pytestmark = pytest.mark.asyncio
+
+DEVICE_OPTIONS = {
+    CONF_T1D: -2.0,
+    CONF_T2D: -4.0,
+    CONF_T3D: -6.0,
+    CONF_T4D: -8.0,
+    CONF_SHUTDOWN_DELAY: 300,
+}
+
+
+@pytest.fixture
+def device():
+    """Replace the controller client used by the options flow."""
+    with patch("custom_components.fcu.config_flow.FCUApi") as api_class:
+        api = api_class.return_value
+        api.async_post = AsyncMock(return_value=(200, "OK"))
+        api.async_close = AsyncMock()
+        yield api
+
+
+async def _save_options(hass, entry, changes):
+    """Run the options flow with the saved options plus changes."""
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    return await hass.config_entries.options.async_configure(
+        result["flow_id"], user_input={**entry.options, **changes}
+    )
+
+
+async def test_options_without_device_changes_skip_the_device(hass, device):
+    """Save options that do not touch the device configuration without a POST."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"name": "Office", "ip_address": "192.0.2.10"},
+        options=DEVICE_OPTIONS,
+    )
+    entry.add_to_hass(hass)
+
+    result = await _save_options(hass, entry, {CONF_LOOP_GROUP: "north"})
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    device.async_post.assert_not_called()
+
+
+async def test_device_changes_are_sent(hass, device):
+    """POST the device configuration when one of its fields changed."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"name": "Office", "ip_address": "192.0.2.10"},
+        options=DEVICE_OPTIONS,
+    )
+    entry.add_to_hass(hass)
+
+    result = await _save_options(hass, entry, {CONF_T1D: -3.0})
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    device.async_post.assert_awaited_once()
+    assert device.async_post.call_args.kwargs["data"]["t1d"] == "-3.0"
+
+
+async def test_device_changes_are_not_sent_while_replaying(hass, device):
+    """Save device options while replaying without reaching for the device."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"name": "Office", "ip_address": "192.0.2.10"},
+        options={**DEVICE_OPTIONS, CONF_REPLAY_FILE: "capture.jsonl"},
+    )
+    entry.add_to_hass(hass)
+
+    result = await _save_options(hass, entry, {CONF_T1D: -3.0})
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    device.async_post.assert_not_called()
+
+
+async def test_timeout_ceiling_below_floor_is_rejected(hass, device):
+    """Show the form again when the longest timeout is below the shortest."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"name": "Office", "ip_address": "192.0.2.10"},
+        options=DEVICE_OPTIONS,
+    )
+    entry.add_to_hass(hass)
+
+    result = await _save_options(
+        hass, entry, {CONF_TIMEOUT_FLOOR: 10.0, CONF_TIMEOUT_CEILING: 5.0}
+    )
+
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {CONF_TIMEOUT_CEILING: "timeout_range"}
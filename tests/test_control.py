@@ -0,0 +1,69 @@
+"""Tests for per-mode setpoint and fan memory."""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from custom_components.fcu import control
+from custom_components.fcu.const import DOMAIN
+from custom_components.fcu.control import ModeMemory
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _settle():
+    """Let the batch timer and the write task run."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+def climate(hass, monkeypatch):
+    """Register a climate entity stand-in that records writes."""
+    monkeypatch.setattr(control, "BATCH_DELAY", 0)
+    entity = SimpleNamespace(async_apply_command=AsyncMock())
+    hass.data.setdefault(DOMAIN, {})["test"] = {"climate": entity}
+    yield entity
+    hass.data[DOMAIN].pop("test")
+
+
+def _memory(hass, mode):
+    """Return a memory for a unit running in the given device mode."""
+    coordinator = SimpleNamespace(
+        data={"operation_mode": mode, "required_temp_cooling": "24", "required_temp_heating": "21"}
+    )
+    lifecycle = SimpleNamespace(async_create_task=hass.async_create_task)
+    return ModeMemory(hass, "test", coordinator, lifecycle), coordinator
+
+
+async def test_change_for_the_running_mode_is_written(hass, climate):
+    """Write changes for the running mode as one command."""
+    memory, _ = _memory(hass, "1")
+    memory.async_stage("1", temperature=23.0)
+    memory.async_stage("1", fan_mode="high")
+    await _settle()
+
+    climate.async_apply_command.assert_awaited_once_with(
+        {"temperature": 23.0, "fan_mode": "high"}
+    )
+    assert not memory.is_staged("1")
+    await memory.async_save()
+
+
+async def test_staged_change_is_written_when_the_unit_enters_the_mode(hass, climate):
+    """Write a change staged for another mode once a poll shows that mode."""
+    memory, coordinator = _memory(hass, "2")
+    memory.async_stage("1", temperature=23.0)
+    await _settle()
+    climate.async_apply_command.assert_not_awaited()
+    assert memory.setpoint("1") == 23.0
+
+    # Switched to cooling at the wall panel
+    coordinator.data = {**coordinator.data, "operation_mode": "1"}
+    memory.async_handle_update()
+    await _settle()
+
+    climate.async_apply_command.assert_awaited_once_with({"temperature": 23.0})
+    assert not memory.is_staged("1")
+    await memory.async_save()
@@ -0,0 +1,61 @@
+"""Tests for runtime and energy accounting."""
+import pytest
+
+from custom_components.fcu.const import CONF_COIL_CAPACITY_HIGH, CONF_FAN_POWER_HIGH
+from custom_components.fcu.energy import EnergyMeter
+
+pytestmark = pytest.mark.asyncio
+
+OPTIONS = {CONF_FAN_POWER_HIGH: 60.0, CONF_COIL_CAPACITY_HIGH: 3.0}
+
+
+def _status(rt, mode="2", heating=22.0, fan="2", device_status="0"):
+    """Return a snapshot running at high speed."""
+    return {
+        "rt": str(rt),
+        "operation_mode": mode,
+        "required_temp_heating": str(heating),
+        "required_temp_cooling": "24.0",
+        "fan_state_current_heating": fan,
+        "fan_state_current_fan": fan,
+        "device_status": device_status,
+    }
+
+
+async def test_interval_is_credited_to_the_previous_state(hass):
+    """Credit time, fan power and coil capacity while the unit heats."""
+    meter = EnergyMeter(hass, "test")
+    meter.add_sample(_status(20.0), OPTIONS, now=0)
+    meter.add_sample(_status(22.5), OPTIONS, now=360)
+
+    assert meter.get("runtime_heating") == pytest.approx(0.1)
+    assert meter.get("runtime_high") == pytest.approx(0.1)
+    assert meter.get("electrical_energy") == pytest.approx(0.006)
+    assert meter.get("thermal_energy") == pytest.approx(0.3)
+
+    # At setpoint the unit idles, so the next interval is not credited
+    meter.add_sample(_status(22.5), OPTIONS, now=720)
+    assert meter.get("runtime_heating") == pytest.approx(0.1)
+    # Write now rather than leave the delayed save timer behind
+    await meter.async_save()
+
+
+async def test_fan_only_has_no_thermal_energy(hass):
+    """Count fan runtime and power but no coil energy in fan mode."""
+    meter = EnergyMeter(hass, "test")
+    meter.add_sample(_status(20.0, mode="3"), OPTIONS, now=0)
+    meter.add_sample(_status(20.0, mode="3"), OPTIONS, now=360)
+
+    assert meter.get("runtime_fan") == pytest.approx(0.1)
+    assert meter.get("electrical_energy") == pytest.approx(0.006)
+    assert meter.get("thermal_energy") == 0
+    await meter.async_save()
+
+
+async def test_outages_are_not_credited(hass):
+    """Skip intervals longer than the maximum sample gap."""
+    meter = EnergyMeter(hass, "test")
+    meter.add_sample(_status(20.0), OPTIONS, now=0)
+    meter.add_sample(_status(20.0), OPTIONS, now=3600)
+
+    assert meter.get("runtime_heating") == 0
@@ -0,0 +1,41 @@
+"""Tests for latency-derived request deadlines."""
+import pytest
+
+from custom_components.fcu.latency import MIN_SAMPLES, LatencyTracker
+
+
+def test_ceiling_until_enough_samples():
+    """Give new controllers the full ceiling until latency is known."""
+    tracker = LatencyTracker(2.0, 15.0)
+    for _ in range(MIN_SAMPLES - 1):
+        tracker.observe(0.1)
+    assert tracker.poll_deadline() == 15.0
+
+
+def test_fast_controllers_get_the_floor():
+    """Clamp short deadlines to the floor."""
+    tracker = LatencyTracker(2.0, 15.0)
+    for _ in range(MIN_SAMPLES):
+        tracker.observe(0.1)
+    assert tracker.poll_deadline() == 2.0
+    assert tracker.write_deadline() == 2.0
+
+
+def test_slow_controllers_get_headroom():
+    """Scale deadlines with the observed latency, writes more than polls."""
+    tracker = LatencyTracker(2.0, 15.0)
+    for _ in range(MIN_SAMPLES):
+        tracker.observe(2.0)
+    assert tracker.poll_deadline() == pytest.approx(4.0)
+    assert tracker.write_deadline() == pytest.approx(6.0)
+
+
+def test_timeouts_push_deadlines_to_the_ceiling():
+    """Count timeouts at their deadline, never going past the ceiling."""
+    tracker = LatencyTracker(2.0, 15.0)
+    for _ in range(MIN_SAMPLES):
+        tracker.observe(1.0)
+    for _ in range(10):
+        tracker.observe_timeout(tracker.poll_deadline())
+    assert tracker.poll_deadline() == 15.0
+    assert tracker.as_dict()["samples"] == MIN_SAMPLES + 10
@@ -0,0 +1,67 @@
+"""Tests for hydronic loop groups."""
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.fcu.loops import async_join_loop
+
+pytestmark = pytest.mark.asyncio
+
+
+def _coordinator(wt, error="0"):
+    """Return a coordinator stand-in with one snapshot."""
+    return SimpleNamespace(
+        data={"wt": wt, "error_index": error},
+        async_add_listener=lambda listener: lambda: None,
+    )
+
+
+async def test_names_differing_in_case_share_a_group(hass):
+    """Key groups by slug, like the loop sensor's unique ID."""
+    loops = {}
+    north, leave_a = async_join_loop(hass, loops, "North", "a", _coordinator("40.0"))
+    same, leave_b = async_join_loop(hass, loops, "north", "b", _coordinator("42.0"))
+
+    assert same is north
+    assert list(loops) == ["north"]
+    leave_a()
+    leave_b()
+    assert loops == {}
+
+
+async def test_joining_aggregates_right_away(hass):
+    """Report loop statistics on join instead of after the next poll."""
+    loops = {}
+    group, leave_a = async_join_loop(hass, loops, "North", "a", _coordinator("40.0"))
+    assert group.stats["median"] == 40.0
+
+    _, leave_b = async_join_loop(hass, loops, "North", "b", _coordinator("44.0", error="2"))
+    assert group.stats["median"] == 42.0
+    assert group.stats["water_temp_low_heating"] == 1
+
+    leave_b()
+    assert group.stats["units"] == 1
+    leave_a()
+
+
+async def test_loop_sensor_moves_to_the_next_owner(hass):
+    """Hand the aggregate sensor to another unit when its owner leaves."""
+    loops = {}
+    added = []
+    group, leave_a = async_join_loop(hass, loops, "North", "a", _coordinator("40.0"))
+    unregister_a = group.async_register_sensor_platform("a", lambda: added.append("a"))
+    _, leave_b = async_join_loop(hass, loops, "North", "b", _coordinator("42.0"))
+    unregister_b = group.async_register_sensor_platform("b", lambda: added.append("b"))
+    assert added == ["a"]
+
+    # The owner reloads: its platform unloads first, then it leaves and rejoins
+    unregister_a()
+    leave_a()
+    assert added == ["a", "b"]
+    _, leave_a = async_join_loop(hass, loops, "North", "a", _coordinator("40.0"))
+    group.async_register_sensor_platform("a", lambda: added.append("a"))
+    assert added == ["a", "b"]
+
+    unregister_b()
+    leave_b()
+    leave_a()
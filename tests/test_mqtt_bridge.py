@@ -0,0 +1,191 @@
+"""Tests for the MQTT bridge, run against a stand-in broker."""
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.fcu.api import (
+    CONTROL_ENDPOINT,
+    MODE_FAN_KEYS,
+    MODE_SETPOINT_KEYS,
+    FCUApi,
+)
+from custom_components.fcu.const import CONF_MQTT_BRIDGE, CONF_MQTT_TOPIC, DOMAIN
+
+pytestmark = pytest.mark.asyncio
+
+BASE_TOPIC = "fcu/office"
+
+STATUS = {
+    "rt": "20.5",
+    "wt": "45.0",
+    "operation_mode": "2",
+    "required_temp_heating": "21",
+    "required_temp_cooling": "24",
+    "fan_state_current_cooling": "3",
+    "fan_state_current_heating": "3",
+    "fan_state_current_fan": "3",
+    "device_status": "0",
+    "error_index": "0",
+}
+
+
+class FakeBroker:
+    """Record publishes and deliver messages to subscribers."""
+
+    def __init__(self):
+        """Initialize the broker."""
+        self.published = []
+        self.subscriptions = {}
+
+    async def async_publish(self, hass, topic, payload, qos=0, retain=False):
+        """Record a publish."""
+        self.published.append((topic, payload, retain))
+
+    async def async_subscribe(self, hass, topic, msg_callback, *args, **kwargs):
+        """Register a subscriber."""
+        self.subscriptions[topic] = msg_callback
+        return lambda: self.subscriptions.pop(topic, None)
+
+    def deliver(self, topic, payload):
+        """Deliver a message as the MQTT component would."""
+        self.subscriptions[topic](SimpleNamespace(topic=topic, payload=payload))
+
+    def on(self, topic):
+        """Return the (payload, retain) pairs published on a topic."""
+        return [(payload, retain) for name, payload, retain in self.published if name == topic]
+
+
+class FakeController:
+    """Answer status reads and apply control writes like the firmware."""
+
+    def __init__(self):
+        """Initialize the controller."""
+        self.state = dict(STATUS)
+        self.writes = []
+
+    async def async_post(self, endpoint, data=None, timeout=None):
+        """Serve one request."""
+        if endpoint == CONTROL_ENDPOINT:
+            self.writes.append(dict(data))
+            mode = data["required_mode"]
+            self.state["operation_mode"] = mode
+            if mode in MODE_SETPOINT_KEYS:
+                self.state[MODE_SETPOINT_KEYS[mode]] = data["required_temp"]
+            if mode in MODE_FAN_KEYS:
+                self.state[MODE_FAN_KEYS[mode]] = data["required_speed"]
+            # No status in the reply, so the write is confirmed by a read
+            return 200, "OK"
+        return 200, json.dumps(self.state)
+
+    async def async_close(self):
+        """Nothing to close."""
+
+
+@pytest.fixture
+def broker():
+    """Replace the MQTT component with a stand-in broker."""
+    fake = FakeBroker()
+    with patch(
+        "custom_components.fcu.mqtt_bridge.mqtt.async_wait_for_mqtt_client",
+        AsyncMock(return_value=True),
+    ), patch(
+        "custom_components.fcu.mqtt_bridge.mqtt.async_publish", fake.async_publish
+    ), patch(
+        "custom_components.fcu.mqtt_bridge.mqtt.async_subscribe", fake.async_subscribe
+    ):
+        yield fake
+
+
+@pytest.fixture
+def controller():
+    """Replace the HTTP transport with a fake controller."""
+    fake = FakeController()
+    with patch("custom_components.fcu.api.HttpTransport", return_value=fake):
+        yield fake
+
+
+@pytest_asyncio.fixture
+async def entry(hass, broker, controller):
+    """Set up an entry with the MQTT bridge enabled."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={"name": "Office", "ip_address": "192.0.2.10"},
+        options={CONF_MQTT_BRIDGE: True, CONF_MQTT_TOPIC: BASE_TOPIC},
+    )
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    yield entry
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_state_is_retained_and_published_on_change(hass, entry, broker, controller):
+    """Publish the retained state only when the snapshot changes."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    states = broker.on(f"{BASE_TOPIC}/state")
+    assert len(states) == 1
+    assert states[0][1] is True
+    assert json.loads(states[0][0])["rt"] == "20.5"
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert len(broker.on(f"{BASE_TOPIC}/state")) == 1
+
+    controller.state["rt"] = "20.8"
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    states = broker.on(f"{BASE_TOPIC}/state")
+    assert len(states) == 2
+    assert json.loads(states[1][0])["rt"] == "20.8"
+
+
+async def test_command_is_one_write_with_a_result(hass, entry, broker, controller):
+    """Send a /set command as one control write and publish its result."""
+    with patch.object(
+        FCUApi, "async_send_control", autospec=True, side_effect=FCUApi.async_send_control
+    ) as send_control:
+        broker.deliver(
+            f"{BASE_TOPIC}/set",
+            json.dumps({"hvac_mode": "cool", "temperature": 23.5, "fan_mode": "high"}),
+        )
+        await hass.async_block_till_done()
+
+    assert send_control.call_count == 1
+    assert controller.writes == [
+        {"required_temp": "23.5", "required_mode": "1", "required_speed": "2"}
+    ]
+    results = [json.loads(payload) for payload, _ in broker.on(f"{BASE_TOPIC}/result")]
+    assert len(results) == 1
+    assert results[0]["success"] is True
+    assert results[0]["state"]["operation_mode"] == "1"
+    assert results[0]["state"]["required_temp_cooling"] == "23.5"
+
+
+async def test_results_follow_every_write(hass, entry, broker, controller):
+    """Publish a result after each control write."""
+    for temperature in (21.5, 22.0):
+        broker.deliver(f"{BASE_TOPIC}/set", json.dumps({"temperature": temperature}))
+        await hass.async_block_till_done()
+
+    results = [json.loads(payload) for payload, _ in broker.on(f"{BASE_TOPIC}/result")]
+    assert [result["request"]["required_temp"] for result in results] == ["21.5", "22.0"]
+    assert all(result["success"] for result in results)
+    assert len(controller.writes) == 2
+
+
+@pytest.mark.parametrize(
+    "payload", ["not json", "[1, 2]", '{"temperature": null}', '{"hvac_mode": "dry"}']
+)
+async def test_invalid_command_reports_failure(hass, entry, broker, controller, payload):
+    """Reject bad commands with a failure result and no write."""
+    broker.deliver(f"{BASE_TOPIC}/set", payload)
+    await hass.async_block_till_done()
+
+    assert controller.writes == []
+    results = [json.loads(payload) for payload, _ in broker.on(f"{BASE_TOPIC}/result")]
+    assert len(results) == 1
+    assert results[0]["success"] is False
@@ -0,0 +1,65 @@
+"""Tests for recording and replaying controller traffic."""
+import asyncio
+from unittest.mock import patch
+
+import aiohttp
+import pytest
+
+from custom_components.fcu.api import STATUS_ENDPOINT, FCUApi
+from custom_components.fcu.latency import LatencyTracker
+from custom_components.fcu.capture import read_capture
+from custom_components.fcu.replay import RecordingTransport, ReplayTransport
+
+pytestmark = pytest.mark.asyncio
+
+
+class FailingTransport:
+    """Fail every request with the given exception."""
+
+    def __init__(self, error):
+        """Initialize the transport."""
+        self._error = error
+
+    async def async_post(self, endpoint, data=None, timeout=None):
+        """Raise the configured error."""
+        raise self._error
+
+    async def async_close(self):
+        """Nothing to close."""
+
+
+@pytest.mark.parametrize(
+    ("error", "timed_out"),
+    [
+        (asyncio.TimeoutError(), True),
+        (aiohttp.ServerTimeoutError("read timeout"), True),
+        (aiohttp.ClientConnectionError("refused"), False),
+    ],
+)
+async def test_timeouts_replay_as_timeouts(hass, tmp_path, error, timed_out):
+    """Replay recorded timeouts, including aiohttp's, as timeouts."""
+    path = tmp_path / "capture.jsonl"
+    recorder = RecordingTransport(hass, FailingTransport(error), str(path))
+    with pytest.raises(type(error)):
+        await recorder.async_post(STATUS_ENDPOINT, None, 5)
+    await recorder.async_close()
+
+    records = read_capture(path)
+    assert len(records) == 1
+    assert records[0].get("to", False) is timed_out
+
+    api = FCUApi("192.0.2.10", transport=ReplayTransport(records, speed=0))
+    with patch.object(LatencyTracker, "observe_timeout") as observe_timeout:
+        with pytest.raises(asyncio.TimeoutError if timed_out else aiohttp.ClientError):
+            await api.async_post(STATUS_ENDPOINT, timeout=5)
+    assert observe_timeout.called is timed_out
+
+
+async def test_legacy_timeout_records_still_replay():
+    """Replay captures written before the timeout flag by type name."""
+    replay = ReplayTransport(
+        [{"t": 0, "ep": STATUS_ENDPOINT, "req": None, "ms": 5, "err": "TimeoutError"}],
+        speed=0,
+    )
+    with pytest.raises(asyncio.TimeoutError):
+        await replay.async_post(STATUS_ENDPOINT)
@@ -0,0 +1,187 @@
+"""Tests for the per-controller request scheduler."""
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from custom_components.fcu.scheduler import (
+    PRIORITY_CONFIRM,
+    PRIORITY_CONTROL,
+    PRIORITY_DIAGNOSTIC,
+    PRIORITY_POLL,
+    RequestScheduler,
+    SchedulerClosedError,
+)
+
+pytestmark = pytest.mark.asyncio
+
+
+class FakeController:
+    """Record the order requests are served in."""
+
+    def __init__(self):
+        """Initialize the controller."""
+        self.calls = []
+        self.release = asyncio.Event()
+
+    def request(self, name, result=None, error=None, block=False):
+        """Return a request factory."""
+
+        async def run():
+            self.calls.append(name)
+            if block:
+                await self.release.wait()
+            if error is not None:
+                raise error
+            return result if result is not None else name
+
+        return run
+
+
+async def _settle():
+    """Let queued tasks run until they wait again."""
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+@pytest_asyncio.fixture
+async def scheduler(hass):
+    """Return a started scheduler."""
+    scheduler = RequestScheduler("test")
+    scheduler.async_start(hass)
+    yield scheduler
+    await scheduler.async_stop()
+
+
+async def _busy(scheduler, controller):
+    """Keep the worker busy with a blocking request."""
+    task = asyncio.create_task(
+        scheduler.async_submit(PRIORITY_CONFIRM, controller.request("busy", block=True))
+    )
+    await _settle()
+    return task
+
+
+async def test_requests_are_served_most_urgent_first(scheduler):
+    """Serve control writes, then confirmations, polls and diagnostics."""
+    controller = FakeController()
+    busy = await _busy(scheduler, controller)
+    tasks = [
+        asyncio.create_task(scheduler.async_submit(priority, controller.request(name)))
+        for priority, name in (
+            (PRIORITY_DIAGNOSTIC, "diagnostic"),
+            (PRIORITY_POLL, "poll"),
+            (PRIORITY_CONFIRM, "confirm"),
+            (PRIORITY_CONTROL, "control"),
+        )
+    ]
+    await _settle()
+    controller.release.set()
+    await asyncio.gather(busy, *tasks)
+
+    assert controller.calls == ["busy", "control", "confirm", "poll", "diagnostic"]
+
+
+async def test_polls_are_absorbed_by_a_write(scheduler):
+    """Answer queued polls with the write's result instead of reading."""
+    controller = FakeController()
+    busy = await _busy(scheduler, controller)
+    poll = asyncio.create_task(
+        scheduler.async_submit(PRIORITY_POLL, controller.request("poll"), skippable=True)
+    )
+    await _settle()
+    write = asyncio.create_task(
+        scheduler.async_submit(PRIORITY_CONTROL, controller.request("write", {"mode": "1"}))
+    )
+    await _settle()
+    controller.release.set()
+
+    assert await write == {"mode": "1"}
+    assert await poll == {"mode": "1"}
+    await busy
+    assert controller.calls == ["busy", "write"]
+
+
+async def test_polls_run_after_a_failed_write(scheduler):
+    """Put absorbed polls back in the queue when the write fails."""
+    controller = FakeController()
+    busy = await _busy(scheduler, controller)
+    poll = asyncio.create_task(
+        scheduler.async_submit(PRIORITY_POLL, controller.request("poll"), skippable=True)
+    )
+    await _settle()
+    write = asyncio.create_task(
+        scheduler.async_submit(
+            PRIORITY_CONTROL, controller.request("write", error=RuntimeError("refused"))
+        )
+    )
+    await _settle()
+    controller.release.set()
+
+    with pytest.raises(RuntimeError):
+        await write
+    assert await poll == "poll"
+    await busy
+    assert controller.calls == ["busy", "write", "poll"]
+
+
+async def test_identical_polls_share_one_request(scheduler):
+    """Serve identical skippable polls with a single request."""
+    controller = FakeController()
+    busy = await _busy(scheduler, controller)
+    request = controller.request("poll")
+    polls = [
+        asyncio.create_task(scheduler.async_submit(PRIORITY_POLL, request, skippable=True))
+        for _ in range(3)
+    ]
+    await _settle()
+    controller.release.set()
+
+    assert await asyncio.gather(*polls) == ["poll", "poll", "poll"]
+    await busy
+    assert controller.calls == ["busy", "poll"]
+
+
+async def test_drain_finishes_writes_and_drops_polls(scheduler):
+    """Finish writes within the deadline, drop polls and refuse new ones."""
+    controller = FakeController()
+    busy = await _busy(scheduler, controller)
+    poll = asyncio.create_task(
+        scheduler.async_submit(PRIORITY_POLL, controller.request("poll"))
+    )
+    write = asyncio.create_task(
+        scheduler.async_submit(PRIORITY_CONTROL, controller.request("write"))
+    )
+    await _settle()
+
+    drain = asyncio.create_task(scheduler.async_drain(1))
+    await _settle()
+    controller.release.set()
+
+    assert await drain is True
+    assert await write == "write"
+    with pytest.raises(asyncio.CancelledError):
+        await poll
+    await busy
+    assert controller.calls == ["busy", "write"]
+    with pytest.raises(SchedulerClosedError):
+        await scheduler.async_submit(PRIORITY_POLL, controller.request("late"))
+
+
+async def test_stop_cancels_what_misses_the_drain_deadline(scheduler):
+    """Report a missed deadline and cancel in-flight and queued work on stop."""
+    controller = FakeController()
+    busy = await _busy(scheduler, controller)
+    write = asyncio.create_task(
+        scheduler.async_submit(PRIORITY_CONTROL, controller.request("write"))
+    )
+    await _settle()
+
+    assert await scheduler.async_drain(0.01) is False
+    await scheduler.async_stop()
+
+    with pytest.raises(asyncio.CancelledError):
+        await busy
+    with pytest.raises(asyncio.CancelledError):
+        await write
+    assert controller.calls == ["busy"]
@@ -0,0 +1,96 @@
+"""Tests for the learned thermal model."""
+from datetime import datetime, timedelta, timezone
+import math
+
+import pytest
+
+from custom_components.fcu.const import (
+    CONF_OCCUPANCY_START,
+    CONF_PRECONDITION,
+    CONF_PRECONDITION_MAX_LEAD,
+)
+from custom_components.fcu.thermal import ThermalModel
+
+pytestmark = pytest.mark.asyncio
+
+START = datetime(2026, 1, 5, 5, 0, tzinfo=timezone.utc)
+POLL = timedelta(seconds=30)
+OPTIONS = {
+    CONF_PRECONDITION: True,
+    CONF_OCCUPANCY_START: "08:00",
+    CONF_PRECONDITION_MAX_LEAD: 120,
+}
+
+
+def _status(rt, wt=45.0, mode="2", heating=22.0, cooling=24.0):
+    """Return a heating snapshot."""
+    return {
+        "rt": str(round(rt, 3)),
+        "wt": str(wt),
+        "operation_mode": mode,
+        "required_temp_heating": str(heating),
+        "required_temp_cooling": str(cooling),
+        "fan_state_current_heating": "3",
+        "fan_state_current_cooling": "3",
+    }
+
+
+async def test_idle_time_at_setpoint_is_not_learned(hass):
+    """Learn the heating rate, not the idle time once at setpoint."""
+    model = ThermalModel(hass, "test")
+    now, room = START, 18.0
+    for poll in range(400):
+        model.add_sample(_status(room), now)
+        if poll % 7 == 0:
+            # The refresh a write triggers lands seconds after the poll
+            model.add_sample(_status(room + 0.1), now + timedelta(seconds=3))
+        now += POLL
+        room = min(room + 0.025, 22.0)
+
+    assert model.predict_rate("2", "3", 45.0 - 18.0) == pytest.approx(0.05, abs=0.002)
+    # Write now rather than leave the delayed save timer behind
+    await model.async_save()
+
+
+async def test_lead_time_follows_the_slowing_rate(hass):
+    """Integrate the fitted rate instead of projecting it linearly."""
+    model = ThermalModel(hass, "test")
+    slope, water = 0.004, 45.0
+    now, room = START, 15.0
+    for _ in range(120):
+        model.add_sample(_status(room, water, heating=40.0), now)
+        now += POLL
+        # Exact solution of d(rt)/dt = slope * (wt - rt) over one poll
+        room = water - (water - room) * math.exp(-slope * POLL.total_seconds() / 60)
+
+    minutes = model.minutes_to_setpoint(_status(18.0, water), "2", 22.0)
+    expected = math.log((water - 22.0) / (water - 18.0)) / -slope
+    linear = 4.0 / (slope * (water - 18.0))
+    assert minutes == pytest.approx(expected, rel=0.01)
+    assert minutes > linear
+    await model.async_save()
+
+
+async def test_precondition_skips_non_numeric_setpoints(hass):
+    """Ignore setpoints the controller does not report as numbers."""
+    model = ThermalModel(hass, "test")
+    data = _status(18.0, mode="0")
+    data["required_temp_heating"] = "--"
+    data["required_temp_cooling"] = None
+
+    assert model.precondition_mode(data, OPTIONS, START.replace(hour=7)) is None
+
+
+async def test_precondition_repeats_until_marked(hass):
+    """Keep asking to start until a write went through, then stop for the day."""
+    model = ThermalModel(hass, "test")
+    now = START.replace(hour=7)
+    data = _status(18.0, mode="0")
+
+    assert model.precondition_mode(data, OPTIONS, now) == "2"
+    # The write failed, so the next poll asks again
+    assert model.precondition_mode(data, OPTIONS, now + POLL) == "2"
+
+    model.mark_preconditioned(now + POLL)
+    assert model.precondition_mode(data, OPTIONS, now + 2 * POLL) is None
+    assert model.precondition_mode(data, OPTIONS, now + timedelta(days=1)) == "2"